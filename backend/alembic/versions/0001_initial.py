@@ -0,0 +1,73 @@
+"""İlk şema: users, customers, collaboration_codes
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("can_manage_customers", sa.Boolean(), nullable=True),
+        sa.Column("can_manage_financial", sa.Boolean(), nullable=True),
+        sa.Column("can_manage_collaboration_codes", sa.Boolean(), nullable=True),
+        sa.Column("can_view_collaboration_stats", sa.Boolean(), nullable=True),
+        sa.Column("can_manage_access", sa.Boolean(), nullable=True),
+        sa.Column("can_delete_users", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("surname", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("grade", sa.String(), nullable=False),
+        sa.Column("camps", sa.Text(), nullable=False),
+        sa.Column("prices", sa.Text(), nullable=False),
+        sa.Column("code", sa.String(), nullable=True),
+        sa.Column("previous_rank", sa.String(), nullable=True),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column("deleted_reason", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_customers_email", "customers", ["email"])
+    op.create_index("ix_customers_code", "customers", ["code"])
+
+    op.create_table(
+        "collaboration_codes",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_collaboration_codes_code", "collaboration_codes", ["code"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_collaboration_codes_code", table_name="collaboration_codes")
+    op.drop_table("collaboration_codes")
+    op.drop_index("ix_customers_code", table_name="customers")
+    op.drop_index("ix_customers_email", table_name="customers")
+    op.drop_table("customers")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,74 @@
+"""customers.revenue: fiyatların sayısal toplamı
+
+Revision ID: 0002_customer_revenue
+Revises: 0001_initial
+Create Date: 2026-10-18
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_customer_revenue"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+customers = sa.table(
+    "customers",
+    sa.column("id", sa.String()),
+    sa.column("prices", sa.Text()),
+    sa.column("revenue", sa.Numeric(12, 2)),
+)
+
+
+def _prices_total(prices_str: str) -> float:
+    """app.utils.parse_prices ile aynı kurallar (migration'ın donmuş kopyası)"""
+    try:
+        parsed = json.loads(prices_str)
+        if isinstance(parsed, list):
+            return sum(float(p) for p in parsed if p)
+        return float(parsed) if parsed else 0.0
+    except (json.JSONDecodeError, ValueError, TypeError):
+        try:
+            return sum(float(p.strip()) for p in (prices_str or "").split(",") if p.strip())
+        except ValueError:
+            return 0.0
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("customers") as batch_op:
+        batch_op.add_column(
+            sa.Column("revenue", sa.Numeric(12, 2), nullable=False, server_default="0")
+        )
+    op.create_index("ix_customers_revenue", "customers", ["revenue"])
+
+    # Mevcut satırları id sırasıyla parça parça doldur
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(customers.c.id, customers.c.prices)
+            .where(customers.c.id > last_id)
+            .order_by(customers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        bind.execute(
+            customers.update()
+            .where(customers.c.id == sa.bindparam("customer_id"))
+            .values(revenue=sa.bindparam("total")),
+            [{"customer_id": row.id, "total": _prices_total(row.prices)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index("ix_customers_revenue", table_name="customers")
+    with op.batch_alter_table("customers") as batch_op:
+        batch_op.drop_column("revenue")
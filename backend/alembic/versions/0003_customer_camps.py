@@ -0,0 +1,98 @@
+"""customer_camps: müşteri başına kamp satırları
+
+Revision ID: 0003_customer_camps
+Revises: 0002_customer_revenue
+Create Date: 2026-10-18
+"""
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_customer_camps"
+down_revision = "0002_customer_revenue"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+customers = sa.table(
+    "customers",
+    sa.column("id", sa.String()),
+    sa.column("camps", sa.Text()),
+    sa.column("prices", sa.Text()),
+    sa.column("is_deleted", sa.Boolean()),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def _split(value: str) -> list:
+    """JSON liste ya da virgülle ayrılmış string (app.utils ile aynı kurallar)"""
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return [p for p in parsed if p]
+        return [parsed] if parsed else []
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return [p.strip() for p in (value or "").split(",") if p.strip()]
+
+
+def _line_items(row) -> list:
+    try:
+        prices = [float(p) for p in _split(row.prices)]
+    except ValueError:
+        prices = []
+    camps = [str(c).strip() for c in _split(row.camps) if str(c).strip()]
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "customer_id": row.id,
+            "position": position,
+            "camp": camp,
+            "price": prices[position] if position < len(prices) else 0.0,
+            "is_deleted": bool(row.is_deleted),
+            "created_at": row.created_at,
+        }
+        for position, camp in enumerate(camps)
+    ]
+
+
+def upgrade() -> None:
+    customer_camps = op.create_table(
+        "customer_camps",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("customer_id", sa.String(), sa.ForeignKey("customers.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("camp", sa.String(), nullable=False),
+        sa.Column("price", sa.Numeric(12, 2), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_customer_camps_customer_id", "customer_camps", ["customer_id"])
+    op.create_index("ix_customer_camps_created_at_camp", "customer_camps", ["created_at", "camp"])
+
+    # Mevcut müşterileri id sırasıyla parça parça dönüştür
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(customers)
+            .where(customers.c.id > last_id)
+            .order_by(customers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        items = [item for row in rows for item in _line_items(row)]
+        if items:
+            bind.execute(customer_camps.insert(), items)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index("ix_customer_camps_created_at_camp", table_name="customer_camps")
+    op.drop_index("ix_customer_camps_customer_id", table_name="customer_camps")
+    op.drop_table("customer_camps")
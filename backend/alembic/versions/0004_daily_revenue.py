@@ -0,0 +1,56 @@
+"""daily_revenue: gün x işbirliği kodu özet tablosu
+
+Revision ID: 0004_daily_revenue
+Revises: 0003_customer_camps
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_daily_revenue"
+down_revision = "0003_customer_camps"
+branch_labels = None
+depends_on = None
+
+customers = sa.table(
+    "customers",
+    sa.column("id", sa.String()),
+    sa.column("code", sa.String()),
+    sa.column("revenue", sa.Numeric(12, 2)),
+    sa.column("is_deleted", sa.Boolean()),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    daily_revenue = op.create_table(
+        "daily_revenue",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("code", sa.String(), primary_key=True),
+        sa.Column("customer_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+    )
+
+    # Mevcut müşterilerden tek INSERT ... SELECT ile doldur
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        day = sa.func.date(sa.func.timezone("UTC", customers.c.created_at))
+    else:
+        day = sa.func.date(customers.c.created_at)
+    code = sa.func.coalesce(customers.c.code, "")
+    op.execute(
+        daily_revenue.insert().from_select(
+            ["day", "code", "customer_count", "revenue"],
+            sa.select(
+                day,
+                code,
+                sa.func.count(customers.c.id),
+                sa.func.coalesce(sa.func.sum(customers.c.revenue), 0),
+            ).where(customers.c.is_deleted == sa.false()).group_by(day, code),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_revenue")
@@ -0,0 +1,26 @@
+"""users.permissions_version: token'lardaki yetki sürümü
+
+Revision ID: 0005_user_permissions_version
+Revises: 0004_daily_revenue
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_user_permissions_version"
+down_revision = "0004_daily_revenue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("permissions_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("permissions_version")
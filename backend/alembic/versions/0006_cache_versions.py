@@ -0,0 +1,26 @@
+"""cache_versions: süreç içi önbelleklerin sürüm damgası
+
+Revision ID: 0006_cache_versions
+Revises: 0005_user_permissions_version
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_cache_versions"
+down_revision = "0005_user_permissions_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cache_versions")
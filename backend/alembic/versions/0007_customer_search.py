@@ -0,0 +1,114 @@
+"""customers.search_text: arama kolonu, Postgres'te trigram index, SQLite'ta FTS5
+
+Revision ID: 0007_customer_search
+Revises: 0006_cache_versions
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_customer_search"
+down_revision = "0006_cache_versions"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+customers = sa.table(
+    "customers",
+    sa.column("id", sa.String()),
+    sa.column("name", sa.String()),
+    sa.column("surname", sa.String()),
+    sa.column("email", sa.String()),
+    sa.column("phone", sa.String()),
+    sa.column("city", sa.String()),
+    sa.column("search_text", sa.Text()),
+)
+
+_FOLD = str.maketrans({
+    "ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c",
+    "â": "a", "î": "i", "û": "u",
+})
+
+
+def _search_text(name, surname, email, phone, city) -> str:
+    """app.utils.customer_search_text ile aynı kurallar (migration'ın donmuş kopyası)"""
+    phone = phone or ""
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    text = " ".join([name or "", surname or "", email or "", phone, digits, city or ""])
+    return text.replace("İ", "i").replace("I", "ı").lower().translate(_FOLD)
+
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE customers_fts USING fts5("
+    "search_text, content='customers', content_rowid='rowid')",
+    "CREATE TRIGGER customers_fts_ai AFTER INSERT ON customers BEGIN "
+    "INSERT INTO customers_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "CREATE TRIGGER customers_fts_ad AFTER DELETE ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); END",
+    "CREATE TRIGGER customers_fts_au AFTER UPDATE OF search_text ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); "
+    "INSERT INTO customers_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("customers") as batch_op:
+        batch_op.add_column(sa.Column("search_text", sa.Text(), nullable=True))
+
+    # Mevcut satırları id sırasıyla parça parça doldur
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(
+                customers.c.id, customers.c.name, customers.c.surname,
+                customers.c.email, customers.c.phone, customers.c.city
+            )
+            .where(customers.c.id > last_id)
+            .order_by(customers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        bind.execute(
+            customers.update()
+            .where(customers.c.id == sa.bindparam("customer_id"))
+            .values(search_text=sa.bindparam("text")),
+            [
+                {
+                    "customer_id": row.id,
+                    "text": _search_text(row.name, row.surname, row.email, row.phone, row.city),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_customers_search_text_trgm ON customers "
+            "USING gin (search_text gin_trgm_ops)"
+        )
+    elif bind.dialect.name == "sqlite":
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_customers_search_text_trgm")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("customers_fts_ai", "customers_fts_ad", "customers_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS customers_fts")
+
+    with op.batch_alter_table("customers") as batch_op:
+        batch_op.drop_column("search_text")
@@ -0,0 +1,50 @@
+"""Sorgu şekillerine göre bileşik ve kısmi (is_deleted = false) index'ler
+
+Revision ID: 0008_query_indexes
+Revises: 0007_customer_search
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_query_indexes"
+down_revision = "0007_customer_search"
+branch_labels = None
+depends_on = None
+
+ACTIVE_ONLY = {
+    "postgresql_where": sa.text("is_deleted = false"),
+    "sqlite_where": sa.text("is_deleted = 0"),
+}
+
+INDEXES = [
+    ("ix_customers_active_created_at", "customers", ["created_at", "id"]),
+    ("ix_customers_active_code_created_at", "customers", ["code", "created_at", "id"]),
+    ("ix_customers_active_city_created_at", "customers", ["city", "created_at", "id"]),
+    ("ix_customers_active_revenue", "customers", ["revenue"]),
+    ("ix_customer_camps_active_created_at", "customer_camps", ["created_at", "camp", "customer_id", "price"]),
+]
+
+# Yeni kısmi index'lerin yerini aldığı eski index'ler
+REPLACED = [
+    ("ix_customers_revenue", "customers", ["revenue"]),
+    ("ix_customer_camps_created_at_camp", "customer_camps", ["created_at", "camp"]),
+]
+
+
+def upgrade() -> None:
+    # PostgreSQL'de tabloyu kilitlememek için CONCURRENTLY (transaction dışında çalışmalı)
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, **ACTIVE_ONLY)
+        for name, table, _ in REPLACED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
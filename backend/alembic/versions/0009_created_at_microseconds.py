@@ -0,0 +1,33 @@
+"""SQLite: saniye hassasiyetinde yazılmış created_at değerlerine mikrosaniye ekle
+
+CURRENT_TIMESTAMP 'YYYY-MM-DD HH:MM:SS' yazar; SQLAlchemy parametreleri
+'.ffffff' ile bağlar. Biçimler karışınca keyset cursor'ındaki eşitlik
+karşılaştırması tutmaz ve sayfalama aynı sayfayı döndürür. PostgreSQL'de işlem yok.
+
+Revision ID: 0009_created_at_microseconds
+Revises: 0008_query_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0009_created_at_microseconds"
+down_revision = "0008_query_indexes"
+branch_labels = None
+depends_on = None
+
+TABLES = ("customers", "customer_camps")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in TABLES:
+        op.execute(
+            f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19"
+        )
+
+
+def downgrade() -> None:
+    # Mikrosaniyeli biçim geriye dönük uyumlu; geri alınacak bir şey yok
+    pass
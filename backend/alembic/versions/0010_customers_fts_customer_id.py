@@ -0,0 +1,71 @@
+"""SQLite: customers_fts müşterilere rowid yerine customer_id ile bağlanır
+
+customers'ın birincil anahtarı metin olduğundan rowid örtüktür; VACUUM ya da
+tabloyu kopyalayan batch_alter_table rowid'leri yeniden numaralandırabilir ve
+external-content FTS tablosu aramayı yanlış müşterilere bağlar. FTS tablosu
+metni artık kendisi tutar, customer_id UNINDEXED kolonu trigger'larla yazılır
+ve arama customers.id üzerinden join edilir. PostgreSQL'de işlem yok.
+
+Revision ID: 0010_customers_fts_customer_id
+Revises: 0009_created_at_microseconds
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0010_customers_fts_customer_id"
+down_revision = "0009_created_at_microseconds"
+branch_labels = None
+depends_on = None
+
+TRIGGERS = ("customers_fts_ai", "customers_fts_ad", "customers_fts_au")
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE customers_fts USING fts5(customer_id UNINDEXED, search_text)",
+    "CREATE TRIGGER customers_fts_ai AFTER INSERT ON customers BEGIN "
+    "INSERT INTO customers_fts(customer_id, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER customers_fts_ad AFTER DELETE ON customers BEGIN "
+    "DELETE FROM customers_fts WHERE customer_id = old.id; END",
+    "CREATE TRIGGER customers_fts_au AFTER UPDATE OF id, search_text ON customers BEGIN "
+    "DELETE FROM customers_fts WHERE customer_id = old.id; "
+    "INSERT INTO customers_fts(customer_id, search_text) VALUES (new.id, new.search_text); END",
+    "INSERT INTO customers_fts(customer_id, search_text) SELECT id, search_text FROM customers",
+]
+
+# 0007_customer_search'teki external-content tablo (downgrade için)
+SQLITE_FTS_ROWID = [
+    "CREATE VIRTUAL TABLE customers_fts USING fts5("
+    "search_text, content='customers', content_rowid='rowid')",
+    "CREATE TRIGGER customers_fts_ai AFTER INSERT ON customers BEGIN "
+    "INSERT INTO customers_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "CREATE TRIGGER customers_fts_ad AFTER DELETE ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); END",
+    "CREATE TRIGGER customers_fts_au AFTER UPDATE OF search_text ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); "
+    "INSERT INTO customers_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')",
+]
+
+
+def _drop_fts() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _drop_fts()
+    for statement in SQLITE_FTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _drop_fts()
+    for statement in SQLITE_FTS_ROWID:
+        op.execute(statement)
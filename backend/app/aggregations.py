@@ -0,0 +1,115 @@
+"""
+İstatistik endpoint'leri için veritabanı tarafında gruplanan toplama sorguları
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import CustomerCamp, DailyRevenue
+from app.code_cache import get_active_codes
+from app.rollups import NO_CODE
+
+
+async def collaboration_totals(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Her aktif işbirliği kodu ve kodsuz müşteriler için müşteri sayısı ile
+    toplam geliri hesapla.
+
+    Toplamlar daily_revenue özet tablosundan koda göre gruplanarak okunur;
+    maliyet müşteri sayısına değil gün x kod sayısına bağlıdır.
+    """
+    codes = (await get_active_codes(db)).codes
+
+    grouped = (await db.execute(
+        select(
+            DailyRevenue.code,
+            func.coalesce(func.sum(DailyRevenue.customer_count), 0),
+            func.coalesce(func.sum(DailyRevenue.revenue), 0)
+        ).group_by(DailyRevenue.code)
+    )).all()
+
+    totals = {code: (int(count), float(revenue)) for code, count, revenue in grouped}
+
+    stats = []
+    for code_id, code in codes:
+        customer_count, total_revenue = totals.get(code, (0, 0.0))
+        stats.append({
+            "code_id": code_id,
+            "code": code,
+            "customer_count": customer_count,
+            "total_revenue": total_revenue
+        })
+
+    customer_count, total_revenue = totals.get(NO_CODE, (0, 0.0))
+    return {
+        "stats": stats,
+        "without_code": {
+            "customer_count": customer_count,
+            "total_revenue": total_revenue
+        }
+    }
+
+
+def period_starts(now: datetime) -> Dict[str, datetime]:
+    """Günlük, haftalık (Pazartesi), aylık ve yıllık dönem başlangıçları"""
+    daily_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "daily": daily_start,
+        "weekly": daily_start - timedelta(days=now.weekday()),
+        "monthly": daily_start.replace(day=1),
+        "yearly": daily_start.replace(month=1, day=1),
+    }
+
+
+async def financial_totals(db: AsyncSession, now: datetime) -> Dict[str, Dict[str, Any]]:
+    """
+    Günlük/haftalık/aylık/yıllık/toplam gelir ve müşteri sayılarını
+    daily_revenue özet tablosu üzerinde tek taramada koşullu toplamlarla hesapla.
+    """
+    starts = period_starts(now)
+    columns = []
+    for start in starts.values():
+        in_window = DailyRevenue.day.between(start.date(), now.date())
+        columns.append(func.sum(case((in_window, DailyRevenue.revenue), else_=0)))
+        columns.append(func.sum(case((in_window, DailyRevenue.customer_count), else_=0)))
+    columns.append(func.sum(DailyRevenue.revenue))
+    columns.append(func.sum(DailyRevenue.customer_count))
+
+    row = (await db.execute(select(*columns))).one()
+
+    result = {}
+    for index, period in enumerate(list(starts) + ["total"]):
+        result[period] = {
+            "revenue": float(row[2 * index] or 0),
+            "customer_count": int(row[2 * index + 1] or 0)
+        }
+    return result
+
+
+async def camp_totals(
+    db: AsyncSession,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Verilen tarih aralığında kamp bazlı müşteri sayısı ve geliri hesapla.
+    Sorgu yalnızca customer_camps tablosunu (created_at, camp) index'i ile okur.
+    """
+    stmt = select(
+        CustomerCamp.camp,
+        func.count(func.distinct(CustomerCamp.customer_id)),
+        func.coalesce(func.sum(CustomerCamp.price), 0)
+    ).where(CustomerCamp.is_deleted == False)
+    if start is not None:
+        stmt = stmt.where(CustomerCamp.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(CustomerCamp.created_at <= end)
+
+    rows = (await db.execute(
+        stmt.group_by(CustomerCamp.camp).order_by(func.sum(CustomerCamp.price).desc())
+    )).all()
+
+    return [
+        {"camp": camp, "customer_count": count, "revenue": float(revenue)}
+        for camp, count, revenue in rows
+    ]
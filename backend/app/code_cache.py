@@ -0,0 +1,100 @@
+"""
+Aktif işbirliği kodlarının süreç içi önbelleği
+
+Kod tablosu küçüktür ve nadiren değişir. Her süreç aktif kodları bellekte
+tutar; collaboration_codes router'ındaki yazma işlemleri aynı transaction
+içinde cache_versions'taki sürümü artırır ve yerel önbelleği temizler.
+Diğer worker'lar sürüm damgasını en fazla CODE_CACHE_CHECK_SECONDS
+aralıkla okuyup değişikliği fark eder. Önbellek süreç geneli olduğu için
+her zaman primary'den doldurulur; gecikmeli bir replika eski kod kümesini
+yazmalara (create_customer) taşıyamaz.
+"""
+import time
+from typing import FrozenSet, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal, dialect_insert, is_replica
+from app.models import CacheVersion, CollaborationCode
+
+CACHE_NAME = "collaboration_codes"
+
+
+class ActiveCodes:
+    """Aktif kodların (created_at'e göre yeniden eskiye) listesi ve O(1) arama kümesi"""
+
+    def __init__(self, version: int, codes: List[Tuple[str, str]]):
+        self.version = version
+        self.codes = codes  # (id, code)
+        self.code_set: FrozenSet[str] = frozenset(code for _, code in codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.code_set
+
+
+_active: Optional[ActiveCodes] = None
+_checked_at = 0.0
+
+
+async def _current_version(db: AsyncSession) -> int:
+    version = await db.scalar(
+        select(CacheVersion.version).where(CacheVersion.name == CACHE_NAME)
+    )
+    return version or 0
+
+
+async def get_active_codes(db: AsyncSession) -> ActiveCodes:
+    """Aktif kodları getir; gerekiyorsa sürüm damgasını kontrol edip yeniden yükle"""
+    if _active is not None and time.monotonic() - _checked_at < settings.CODE_CACHE_CHECK_SECONDS:
+        return _active
+
+    if is_replica(db):
+        async with AsyncSessionLocal() as primary:
+            return await _reload(primary)
+    return await _reload(db)
+
+
+async def _reload(db: AsyncSession) -> ActiveCodes:
+    global _active, _checked_at
+    # Eşzamanlı iki istek aynı anda yeniden yükleyebilir; sonuç aynı olduğu için zararsız
+    version = await _current_version(db)
+    if _active is None or _active.version != version:
+        rows = (await db.execute(
+            select(CollaborationCode.id, CollaborationCode.code).where(
+                CollaborationCode.is_active == True
+            ).order_by(CollaborationCode.created_at.desc())
+        )).all()
+        _active = ActiveCodes(version, [(code_id, code) for code_id, code in rows])
+    _checked_at = time.monotonic()
+    return _active
+
+
+async def is_active_code(db: AsyncSession, code: str) -> bool:
+    return code in await get_active_codes(db)
+
+
+async def bump_version(db: AsyncSession) -> None:
+    """Kod yazmalarıyla aynı transaction'da sürüm damgasını artır"""
+    upsert = dialect_insert(db.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(CacheVersion).values(name=CACHE_NAME, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheVersion.name],
+            set_={"version": CacheVersion.version + 1}
+        )
+        await db.execute(stmt)
+        return
+
+    result = await db.execute(
+        update(CacheVersion).where(CacheVersion.name == CACHE_NAME).values(
+            version=CacheVersion.version + 1
+        )
+    )
+    if result.rowcount == 0:
+        db.add(CacheVersion(name=CACHE_NAME, version=1))
+
+
+def invalidate() -> None:
+    """Bu süreçteki önbelleği temizle (commit sonrası çağrılır)"""
+    global _active
+    _active = None
@@ -1,24 +1,267 @@
-from sqlalchemy import create_engine
+import asyncio
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
+from app import metrics, slow_query_log
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False  # SQL sorgularını görmek için True yapabilirsiniz
+# Async sürücü karşılıkları (API istekleri için)
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL'deki sync sürücüyü async karşılığıyla değiştir"""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+@lru_cache(maxsize=None)
+def get_sync_engine():
+    """
+    Script'ler (seed, bakım komutları) için sync engine. API kullanmadığından
+    ilk çağrıda oluşturulur; uygulama importu sync sürücüyü (psycopg2) yüklemez.
+    """
+    return create_engine(
+        settings.DATABASE_URL,
+        pool_pre_ping=True,
+        echo=False  # SQL sorgularını görmek için True yapabilirsiniz
+    )
+
+
+@lru_cache(maxsize=None)
+def _sync_sessionmaker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
+
+
+def sync_session() -> Session:
+    """get_sync_engine'e bağlı yeni sync session"""
+    return _sync_sessionmaker()()
+
+
+def default_pool_class(url: str):
+    """create_engine'in bu adres için seçeceği havuz sınıfı"""
+    parsed = make_url(url)
+    return parsed.get_dialect().get_pool_class(parsed)
+
+
+def async_engine_options(url: str) -> dict:
+    """DB_POOL_PROFILE'a göre async engine havuz ayarları"""
+    options = {}
+    if settings.DB_POOL_PROFILE in ("serverless", "pgbouncer"):
+        # Havuzlamayı platform/PgBouncer yapar; süreç bağlantı tutmaz
+        pool_class = NullPool
+    else:
+        pool_class = default_pool_class(url)
+        if issubclass(pool_class, QueuePool):
+            options.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            )
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+
+    if settings.DB_POOL_PROFILE == "pgbouncer" and make_url(url).get_driver_name() == "asyncpg":
+        # Transaction pooling'de ardışık ifadeler farklı sunucu bağlantılarına gidebilir
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    options["poolclass"] = metrics.timed_pool(pool_class)
+    return options
+
+
+def create_api_engine(url: str, name: str, connect_timeout: Optional[float] = None):
+    """Havuz profili, metrikler ve yavaş sorgu günlüğüyle async engine"""
+    options = async_engine_options(url)
+    if connect_timeout is not None and make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {**options.get("connect_args", {}), "timeout": connect_timeout}
+    api_engine = create_async_engine(url, echo=False, **options)
+    metrics.instrument_engine(api_engine.sync_engine, name)
+    if settings.SLOW_QUERY_SECONDS > 0:
+        slow_query_log.install(api_engine.sync_engine)
+    return api_engine
+
+
+# FastAPI router'ları için async engine (havuz bekleme süresi ve sorgu metrikleriyle)
+ASYNC_DATABASE_URL = async_database_url(settings.DATABASE_URL)
+async_engine = create_api_engine(ASYNC_DATABASE_URL, "primary")
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # commit sonrası attribute erişimi lazy load tetiklemesin
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Salt okunur route'lar için opsiyonel replika (dependencies.get_read_db)
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_api_engine(
+        async_database_url(settings.DATABASE_REPLICA_URL),
+        "replica",
+        connect_timeout=settings.REPLICA_CONNECT_TIMEOUT_SECONDS
+    )
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency injection için veritabanı session'ı"""
-    db = SessionLocal()
-    try:
+def dialect_insert(dialect_name: str):
+    """INSERT ... ON CONFLICT destekleyen dialect'in insert() fonksiyonu (yoksa None)"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+async def get_db():
+    """Dependency injection için async veritabanı session'ı"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+def _pool_state(api_engine, name: str) -> dict:
+    pool = api_engine.pool
+    stats = {
+        "pool_class": type(pool).__name__,
+        "connections_opened": metrics.DB_CONNECTIONS_OPENED.value(name),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            timeout_seconds=pool.timeout(),
+            recycle_seconds=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    return stats
+
+
+def pool_stats() -> dict:
+    """Async engine havuzlarının anlık durumu (NullPool'da yalnızca açılan bağlantı sayısı)"""
+    stats = {"profile": settings.DB_POOL_PROFILE, **_pool_state(async_engine, "primary")}
+    if replica_engine is not None:
+        stats["replica"] = {
+            "available": replica_available(),
+            **_pool_state(replica_engine, "replica"),
+        }
+    return stats
+
+
+# Replika durumu ve read-your-writes (süreç içi)
+_replica_down_until = 0.0
+_recent_writes: Dict[str, float] = {}  # kullanıcı id -> son yazma commit'i (monotonic)
+_recent_writes_lock = threading.Lock()
+
+
+def replica_available() -> bool:
+    """Replika tanımlı ve son bağlantı hatasının bekleme süresi dolmuş mu"""
+    return ReplicaSessionLocal is not None and time.monotonic() >= _replica_down_until
+
+
+def mark_replica_down() -> None:
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+
+def record_write(user_id: str) -> None:
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[user_id] = now
+        # Süresi dolan kayıtları arada bir temizle
+        if len(_recent_writes) > 1000:
+            for key in [k for k, at in _recent_writes.items() if now - at > settings.REPLICA_READ_YOUR_WRITES_SECONDS]:
+                del _recent_writes[key]
+
+
+def wrote_recently(user_id: str) -> bool:
+    """Kullanıcı replikasyon gecikmesi penceresi içinde yazdı mı"""
+    at = _recent_writes.get(user_id)
+    return at is not None and time.monotonic() - at < settings.REPLICA_READ_YOUR_WRITES_SECONDS
+
+
+def is_replica(db: AsyncSession) -> bool:
+    return bool(db.info.get("replica"))
+
+
+def cache_max_age(db: AsyncSession) -> Optional[float]:
+    """Replikadan hesaplanan önbellekli yanıtın en uzun ömrü (gecikme penceresi); primary'de None"""
+    return settings.REPLICA_READ_YOUR_WRITES_SECONDS if is_replica(db) else None
+
+
+async def replica_session() -> Optional[AsyncSession]:
+    """
+    Bağlantısı alınmış replika session'ı; replika tanımlı değilse ya da
+    erişilemiyorsa None. Bağlantı hatasından sonra REPLICA_RETRY_SECONDS
+    boyunca replika denenmez.
+    """
+    if not replica_available():
+        return None
+    db = ReplicaSessionLocal()
+    try:
+        await db.connection()
+    except (DBAPIError, OSError, asyncio.TimeoutError):
+        await db.close()
+        mark_replica_down()
+        return None
+    db.info["replica"] = True
+    return db
+
+
+async def read_session(prefer_primary: bool = False) -> AsyncSession:
+    """Salt okunur yeni session: mümkünse replika, değilse primary"""
+    db = None if prefer_primary else await replica_session()
+    return db if db is not None else AsyncSessionLocal()
+
+
+# Primary'de yazma yapan session'ların kullanıcısını commit sonrası kaydet
+# (get_current_user session.info["user_id"]'yi doldurur)
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id"):
+        record_write(session.info["user_id"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
@@ -1,20 +1,27 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
-from app.database import get_db
-from app.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, replica_session, wrote_recently
 from app.config import settings
 from app.schemas import TokenData
+from app import user_cache
+from app.user_cache import CachedUser
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """JWT token'dan kullanıcıyı al"""
+    db: AsyncSession = Depends(get_db)
+) -> CachedUser:
+    """
+    JWT token'dan kullanıcıyı al.
+
+    Kullanıcı user_cache'ten okunur (TTL dolana kadar DB sorgusu yok);
+    token'daki yetki sürümü güncel değilse token reddedilir.
+    """
+    from jose import JWTError, jwt  # Soğuk başlangıçta import edilmesin
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -25,19 +32,64 @@ def get_current_user(
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        token_data = TokenData(user_id=user_id)
+        token_data = TokenData(
+            user_id=user_id,
+            permissions_version=payload.get("pv")
+        )
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await user_cache.get_user(db, token_data.user_id)
     if user is None:
         raise credentials_exception
+    
+    token_version = token_data.permissions_version
+    if token_version is not None and token_version > user.permissions_version:
+        # Token önbellektekinden yeni: yetkiler başka bir worker'da değişmiş,
+        # kayıt eskimiş. Kullanıcıyı veritabanından yeniden oku.
+        user_cache.invalidate(user.id)
+        user = await user_cache.get_user(db, token_data.user_id)
+        if user is None:
+            raise credentials_exception
+    
+    # Yetkiler ya da şifre token verildikten sonra değiştiyse yeniden giriş gerekir
+    if token_version is not None and token_version != user.permissions_version:
+        raise credentials_exception
+    
+    # Bu session'da yapılan yazmalar read-your-writes için kullanıcıya işlenir
+    db.info["user_id"] = user.id
     return user
 
 
+def read_primary(request: Request, current_user: CachedUser = Depends(get_current_user)) -> bool:
+    """
+    Okuma primary'den mi yapılmalı: `X-Read-Primary` başlığı gönderildiyse ya da
+    kullanıcı REPLICA_READ_YOUR_WRITES_SECONDS içinde yazdıysa (bu süreçte)
+    """
+    return "x-read-primary" in request.headers or wrote_recently(current_user.id)
+
+
+async def get_read_db(
+    primary: bool = Depends(read_primary),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Salt okunur route'lar için session: DATABASE_REPLICA_URL tanımlıysa replika;
+    yoksa, erişilemiyorsa ya da read_primary ise isteğin primary session'ı
+    """
+    replica = None if primary else await replica_session()
+    if replica is None:
+        yield db
+        return
+    try:
+        yield replica
+    finally:
+        await replica.close()
+
+
 def require_permission(permission: str):
     """Yetki kontrolü için decorator"""
-    def permission_checker(current_user: User = Depends(get_current_user)):
+    async def permission_checker(current_user: CachedUser = Depends(get_current_user)):
         if not hasattr(current_user, permission) or not getattr(current_user, permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -45,4 +97,3 @@ def require_permission(permission: str):
             )
         return current_user
     return permission_checker
-
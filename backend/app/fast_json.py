@@ -0,0 +1,34 @@
+"""
+Büyük liste yanıtları için hızlı JSON yolu
+
+Satırlar ORM nesnesi yerine kolon tuple'ları olarak çekilir ve orjson ile
+doğrudan byte'a çevrilir; response_model ile eleman eleman doğrulama/serileştirme
+atlanır. Kolon sırası ve değer biçimleri response modelinin (ör. CustomerResponse)
+pydantic JSON çıktısıyla aynıdır: datetime ISO 8601, UTC "Z" ile (pydantic gibi).
+Veriler yazılırken şemadan geçtiği için çıkışta yeniden doğrulanmaz.
+"""
+from typing import Iterable, List, Mapping, Optional, Sequence, Type
+import orjson
+from pydantic import BaseModel
+from fastapi.responses import Response
+
+OPTIONS = orjson.OPT_UTC_Z
+
+
+def model_columns(model: Type[BaseModel]) -> List[str]:
+    """Response modelinin alanları, pydantic'in JSON'a yazdığı sırayla"""
+    return list(model.model_fields)
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, option=OPTIONS)
+
+
+def rows_response(
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Kolon tuple'larından JSON dizi yanıtı ([{kolon: değer}, ...])"""
+    body = dumps([dict(zip(columns, row)) for row in rows])
+    return Response(content=body, media_type="application/json", headers=headers)
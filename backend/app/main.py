@@ -1,11 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
 from app.routers import auth, customers, users, collaboration_codes, collaboration_stats, financial
 from app.config import settings
+from app.password_hashing import hashing_stats
+from app.database import pool_stats
+from app import metrics, profiling
 
-# Veritabanı tablolarını oluştur
-Base.metadata.create_all(bind=engine)
+# Şema yönetimi Alembic migration'larında (deploy sırasında `alembic upgrade head`);
+# import sırasında veritabanına bağlanılmaz
 
 app = FastAPI(
     title="Admin Dashboard API",
@@ -20,8 +22,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
+# İstek/SQL metrikleri (/metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# X-Profile başlıklı yetkili istekler için profil (başlık yoksa devre dışı)
+app.add_middleware(profiling.ProfilingMiddleware)
+
 # Router'ları ekle
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(customers.router, prefix="/api/customers", tags=["Customers"])
@@ -40,3 +49,21 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+
+@app.get("/api/health/password-hashing")
+async def password_hashing_health():
+    """bcrypt havuzunun sıra derinliği ve gecikme metrikleri"""
+    return hashing_stats()
+
+
+@app.get("/api/health/database-pool")
+async def database_pool_health():
+    """Bağlantı havuzu profili ve doluluğu"""
+    return pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metin formatında metrikler"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,332 @@
+"""
+Prometheus metin formatında uygulama metrikleri (/metrics)
+
+- Route bazında istek gecikmesi histogramı, durum kodu sayaçları, işlenen istek sayısı
+- İstek başına SQL sorgu sayısı ve süresi (async engine cursor event'leri)
+- Bağlantı havuzundan bağlantı alma (checkout) bekleme süresi, havuz doluluğu,
+  açılan bağlantı sayısı
+- Şifre hashleme havuzu metrikleri
+
+Metrikler süreç içidir; birden fazla worker varsa her worker kendi
+değerlerini raporlar.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Histogram sınırları
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUERY_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        REGISTRY.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self.values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with _lock:
+            items = sorted(self.values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets: Iterable[float] = REQUEST_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket sayıları..., +Inf], toplam, adet
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with _lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        with _lock:
+            items = sorted((labels, ([*counts], total, count)) for labels, (counts, total, count) in self.values.items())
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+REQUESTS = Counter("http_requests_total", "İşlenen HTTP istekleri", ("method", "route", "status"))
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP istek süresi", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Şu an işlenen HTTP istekleri")
+IN_FLIGHT.inc(amount=0)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "İstek başına SQL sorgu sayısı", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    "http_request_db_seconds", "İstek başına toplam SQL süresi", ("method", "route"), QUERY_SECONDS_BUCKETS
+)
+QUERY_SECONDS = Histogram("db_query_duration_seconds", "Tek SQL sorgusunun süresi", (), QUERY_SECONDS_BUCKETS)
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Havuzdan bağlantı alma bekleme süresi", (), POOL_WAIT_BUCKETS
+)
+DB_CONNECTIONS_OPENED = Counter("db_pool_connections_opened_total", "Açılan yeni veritabanı bağlantıları", ("engine",))
+
+
+class RequestStats:
+    """Bir isteğin SQL sayaçları; route yönlendirme sonrası scope'tan okunur"""
+    __slots__ = ("scope", "queries", "query_seconds")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope) if self.scope is not None else "-"
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request() -> Optional[RequestStats]:
+    """Şu an işlenen isteğin sayaçları (istek dışında None)"""
+    return _request_stats.get()
+
+
+def route_label(scope: dict) -> str:
+    """
+    Route şablonu (/api/customers/{customer_id}); yol parametrelerinin değerleri
+    adlarıyla değiştirilir. Hiçbir route'a eşleşmeyen istekler tek etiket altında toplanır.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        "{" + names[segment] + "}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+class MetricsMiddleware:
+    """İstek süresi, durum kodu ve SQL sayaçlarını kaydeden ASGI middleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            method, route = scope["method"], route_label(scope)
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_SECONDS.observe(time.perf_counter() - started, method, route)
+            REQUEST_QUERIES.observe(stats.queries, method, route)
+            REQUEST_QUERY_SECONDS.observe(stats.query_seconds, method, route)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_query_started"].pop()
+    QUERY_SECONDS.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("metrics_query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(sync_engine, name: str = "primary") -> None:
+    """Engine'in cursor event'lerine sorgu sayacı ve süre ölçümü ekle"""
+    from sqlalchemy import event
+
+    def _connect(dbapi_connection, connection_record):
+        DB_CONNECTIONS_OPENED.inc(name)
+
+    DB_CONNECTIONS_OPENED.inc(name, amount=0)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    event.listen(sync_engine, "connect", _connect)
+
+
+def timed_pool(pool_class):
+    """Havuz sınıfının bağlantı alma (_do_get) süresini ölçen alt sınıfı"""
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def _pool_lines() -> List[str]:
+    from app.database import pool_stats
+
+    stats = pool_stats()
+    engines = [("primary", stats)]
+    if "replica" in stats:
+        engines.append(("replica", stats["replica"]))
+    lines = []
+    for key, help_text in (
+        ("size", "Havuz boyutu"),
+        ("checked_out", "Kullanımdaki bağlantılar"),
+        ("checked_in", "Havuzda boşta bekleyen bağlantılar"),
+        ("overflow", "Havuz boyutunun üzerindeki bağlantılar"),
+    ):
+        values = [
+            f"db_pool_{key}{_labels(('engine', 'profile'), (name, stats['profile']))} {engine_stats[key]}"
+            for name, engine_stats in engines if key in engine_stats
+        ]
+        if values:
+            lines += [f"# HELP db_pool_{key} {help_text}", f"# TYPE db_pool_{key} gauge", *values]
+    if "replica" in stats:
+        lines += [
+            "# HELP db_replica_available Replika kullanılabilir mi (bağlantı hatası sonrası bekleme süresinde 0)",
+            "# TYPE db_replica_available gauge",
+            f"db_replica_available {int(stats['replica']['available'])}",
+        ]
+    return lines
+
+
+def _password_hashing_lines() -> List[str]:
+    from app.password_hashing import hashing_stats, LATENCY_BUCKETS
+
+    stats = hashing_stats()
+    lines = [
+        "# HELP password_hash_queue_depth Sırada bekleyen şifre hashleme işleri",
+        "# TYPE password_hash_queue_depth gauge",
+        f"password_hash_queue_depth {stats['queue_depth']}",
+        "# HELP password_hash_running Şu an çalışan şifre hashleme işleri",
+        "# TYPE password_hash_running gauge",
+        f"password_hash_running {stats['running']}",
+    ]
+    for key in ("rejected", "timed_out"):
+        lines += [
+            f"# HELP password_hash_{key}_total Reddedilen ({key}) şifre hashleme istekleri",
+            f"# TYPE password_hash_{key}_total counter",
+            f"password_hash_{key}_total {stats[key]}",
+        ]
+    lines += [
+        "# HELP password_hash_wait_seconds_total Şifre hashleme işlerinin sırada bekleme süresi",
+        "# TYPE password_hash_wait_seconds_total counter",
+        f"password_hash_wait_seconds_total {_number(stats['wait_seconds_total'])}",
+        "# HELP password_hash_duration_seconds Şifre hashleme süresi",
+        "# TYPE password_hash_duration_seconds histogram",
+    ]
+    cumulative = 0
+    for bound in LATENCY_BUCKETS:
+        cumulative += stats["hash_seconds_buckets"][str(bound)]
+        lines.append(f'password_hash_duration_seconds_bucket{{le="{_number(bound)}"}} {cumulative}')
+    cumulative += stats["hash_seconds_buckets"]["+Inf"]
+    lines += [
+        f'password_hash_duration_seconds_bucket{{le="+Inf"}} {cumulative}',
+        f"password_hash_duration_seconds_sum {_number(stats['hash_seconds_total'])}",
+        f"password_hash_duration_seconds_count {stats['completed']}",
+    ]
+    return lines
+
+
+def render() -> str:
+    """Tüm metrikleri Prometheus metin formatında döndür"""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    lines.extend(_password_hashing_lines())
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text
+from sqlalchemy import event, Column, String, Boolean, Date, DateTime, Integer, Text, Numeric, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from app.database import Base
 import uuid
@@ -8,6 +8,14 @@ def generate_id():
     return str(uuid.uuid4())
 
 
+def active_only() -> dict:
+    """Yalnızca silinmemiş satırları kapsayan kısmi index koşulu (PostgreSQL/SQLite)"""
+    return {
+        "postgresql_where": text("is_deleted = false"),
+        "sqlite_where": text("is_deleted = 0"),
+    }
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -22,10 +30,14 @@ class User(Base):
     can_view_collaboration_stats = Column(Boolean, default=False)
     can_manage_access = Column(Boolean, default=False)
     can_delete_users = Column(Boolean, default=False)
+    permissions_version = Column(Integer, nullable=False, default=0, server_default="0")  # Yetki/şifre değişince artar
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # created_at/updated_at INSERT/UPDATE ... RETURNING ile okunur (commit sonrası refresh sorgusu gerekmez)
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class Customer(Base):
     __tablename__ = "customers"
@@ -38,15 +50,50 @@ class Customer(Base):
     grade = Column(String, nullable=False)  # Kaçıncı sınıf
     camps = Column(Text, nullable=False)  # Satın aldığı kamplar (JSON string)
     prices = Column(Text, nullable=False)  # Fiyatlar (JSON string)
+    revenue = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0, server_default="0")  # Fiyatların toplamı
     code = Column(String, nullable=True, index=True)  # İşbirliği kodu
     previous_rank = Column(String, nullable=True)  # Önceki YKS derecesi
     city = Column(String, nullable=False)
+    # Arama için ad/soyad/e-posta/telefon/şehir (Türkçe katlanmış); index'ler migration'da
+    search_text = Column(Text, nullable=True)
     is_deleted = Column(Boolean, default=False)
     deleted_reason = Column(String, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # Liste/export: silinmemişler, created_at/id sırası (keyset sayfalama)
+        Index("ix_customers_active_created_at", "created_at", "id", **active_only()),
+        # Liste filtreleri: kod ya da şehir + aynı sıralama
+        Index("ix_customers_active_code_created_at", "code", "created_at", "id", **active_only()),
+        Index("ix_customers_active_city_created_at", "city", "created_at", "id", **active_only()),
+        # Müşteri bazlı gelir listesi
+        Index("ix_customers_active_revenue", "revenue", **active_only()),
+    )
+
+
+class CustomerCamp(Base):
+    """Müşterinin satın aldığı her kamp için bir satır (camps/prices'ın normalize hali)"""
+    __tablename__ = "customer_camps"
+
+    id = Column(String, primary_key=True, default=generate_id)
+    customer_id = Column(String, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # camps listesindeki sıra
+    camp = Column(String, nullable=False)
+    price = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0)
+    is_deleted = Column(Boolean, nullable=False, default=False)  # Customer.is_deleted kopyası
+    
+    # Müşterinin kayıt zamanı (aynı transaction'da yazıldığı için Customer.created_at ile aynı)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Kamp satışları: tarih aralığı + kamp, müşteri ve fiyat index'ten okunur
+        Index("ix_customer_camps_active_created_at", "created_at", "camp", "customer_id", "price", **active_only()),
+    )
+
 
 class CollaborationCode(Base):
     __tablename__ = "collaboration_codes"
@@ -58,3 +105,35 @@ class CollaborationCode(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __mapper_args__ = {"eager_defaults": True}
+
+
+
+class DailyRevenue(Base):
+    """Gün ve işbirliği kodu bazında müşteri sayısı/gelir özeti (app/rollups.py günceller)"""
+    __tablename__ = "daily_revenue"
+
+    day = Column(Date, primary_key=True)  # Kayıt günü (UTC)
+    code = Column(String, primary_key=True, default="")  # "" = kodsuz müşteriler
+    customer_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2, asdecimal=False), nullable=False, default=0)
+
+
+class CacheVersion(Base):
+    """Süreç içi önbelleklerin worker'lar arası sürüm damgası"""
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def _updated_at_unset(target, args, kwargs):
+    """
+    Yeni nesnede updated_at açıkça NULL olsun; verilmezse eager_defaults
+    INSERT sonrası yalnızca bu kolon için ayrı bir SELECT çalıştırır.
+    """
+    kwargs.setdefault("updated_at", None)
+
+
+for _model in (User, Customer, CollaborationCode):
+    event.listen(_model, "init", _updated_at_unset)
@@ -0,0 +1,138 @@
+"""
+bcrypt işlemlerini event loop dışında, boyutu sınırlı bir thread havuzunda çalıştır
+
+Havuz PASSWORD_HASH_WORKERS thread'den oluşur; en fazla
+PASSWORD_HASH_MAX_QUEUE iş sırada bekleyebilir. Sıra doluysa ya da iş
+PASSWORD_HASH_TIMEOUT_SECONDS içinde bitmezse istek 503 ile reddedilir.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.config import settings
+from app.utils import verify_password, get_password_hash
+
+# Gecikme histogramı sınırları (saniye)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _HashingStats:
+    """Sıra derinliği ve gecikme sayaçları"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queued = 0  # Sırada bekleyen
+        self.running = 0  # Şu an hash'lenen
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "wait_seconds_total": self.wait_seconds_total,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_max": self.hash_seconds_max,
+                "hash_seconds_buckets": {
+                    **{str(bound): count for bound, count in zip(LATENCY_BUCKETS, self.buckets)},
+                    "+Inf": self.buckets[-1],
+                },
+            }
+
+
+_stats = _HashingStats()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash"
+                )
+    return _executor
+
+
+def _timed(func, submitted_at: float, *args):
+    """Havuzdaki thread'de çalışır: bekleme ve hash sürelerini kaydeder"""
+    started_at = time.perf_counter()
+    with _stats.lock:
+        _stats.queued -= 1
+        _stats.running += 1
+        _stats.wait_seconds_total += started_at - submitted_at
+    try:
+        return func(*args)
+    finally:
+        elapsed = time.perf_counter() - started_at
+        with _stats.lock:
+            _stats.running -= 1
+            _stats.completed += 1
+            _stats.hash_seconds_total += elapsed
+            _stats.hash_seconds_max = max(_stats.hash_seconds_max, elapsed)
+            index = next(
+                (i for i, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound),
+                len(LATENCY_BUCKETS)
+            )
+            _stats.buckets[index] += 1
+
+
+def _release_if_cancelled(future):
+    """Sırada beklerken iptal edilen iş _timed'a hiç girmez; sıra sayacını burada düş"""
+    if future.cancelled():
+        with _stats.lock:
+            _stats.queued -= 1
+
+
+async def _run(func, *args):
+    busy = HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Sunucu yoğun, lütfen tekrar deneyin",
+        headers={"Retry-After": "1"},
+    )
+    with _stats.lock:
+        if _stats.queued + _stats.running >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+            _stats.rejected += 1
+            raise busy
+        _stats.queued += 1
+
+    future = _get_executor().submit(_timed, func, time.perf_counter(), *args)
+    future.add_done_callback(_release_if_cancelled)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        # Sırada bekleyen iş iptal edilir (_release_if_cancelled sayacı düşer);
+        # başlamış iş iptal edilemez, bitince _timed sayaçları kendisi düzeltir
+        with _stats.lock:
+            _stats.timed_out += 1
+        raise busy
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password'ün havuzda çalışan async karşılığı"""
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash'in havuzda çalışan async karşılığı"""
+    return await _run(get_password_hash, password)
+
+
+def hashing_stats() -> dict:
+    """Havuz metrikleri (sıra derinliği, gecikmeler)"""
+    return _stats.snapshot()
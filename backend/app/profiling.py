@@ -0,0 +1,136 @@
+"""
+İstek bazında isteğe bağlı profil çıkarma (X-Profile başlığı)
+
+`X-Profile: cprofile` (ya da `sample`) başlığı gönderen ve `can_manage_access`
+yetkisi olan kullanıcının o isteği profillenir; dosyalar PROFILE_DIR'e yazılır
+ve yanıtın `X-Profile-File` başlığında adı döner:
+
+    cprofile - <ad>.prof (snakeviz, tuna, flameprof ile açılır) + <ad>.txt özet
+    sample   - pyinstrument kuruluysa <ad>.speedscope.json (speedscope.app) + <ad>.txt;
+               kurulu değilse cprofile kullanılır
+
+Başlık yoksa middleware yalnızca başlık listesine bakar, başka iş yapmaz.
+Aynı anda tek istek profillenir (cProfile süreçte tek profiler'a izin verir);
+cProfile event loop thread'indeki her şeyi ölçtüğü için o sırada işlenen diğer
+isteklerin kodu da rapora girebilir, pyinstrument yalnızca bu isteği ölçer.
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import HTTPException
+from app.config import settings
+
+HEADER = b"x-profile"
+MODES = ("cprofile", "sample")
+
+_running = asyncio.Lock()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _is_authorized(scope) -> bool:
+    """Bearer token geçerli ve kullanıcının can_manage_access yetkisi var mı"""
+    from app.database import AsyncSessionLocal
+    from app.dependencies import get_current_user
+
+    scheme, _, token = (_header(scope, b"authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user(token=token, db=db)
+        except HTTPException:
+            return False
+    return user.can_manage_access
+
+
+def _file_stem(scope) -> str:
+    path = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"{timestamp}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}"
+
+
+def _write_cprofile(profiler: cProfile.Profile, stem: str) -> None:
+    profiler.dump_stats(os.path.join(settings.PROFILE_DIR, stem + ".prof"))
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats("cumulative").print_stats(settings.PROFILE_TOP_FUNCTIONS)
+    stats.sort_stats("tottime").print_stats(settings.PROFILE_TOP_FUNCTIONS)
+    with open(os.path.join(settings.PROFILE_DIR, stem + ".txt"), "w", encoding="utf-8") as f:
+        f.write(summary.getvalue())
+
+
+def _write_sample(profiler, stem: str) -> None:
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    with open(os.path.join(settings.PROFILE_DIR, stem + ".speedscope.json"), "w", encoding="utf-8") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+    with open(os.path.join(settings.PROFILE_DIR, stem + ".txt"), "w", encoding="utf-8") as f:
+        f.write(profiler.output_text(unicode=True))
+
+
+def _sampling_profiler():
+    """pyinstrument opsiyonel bağımlılık; kurulu değilse None"""
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    return Profiler(async_mode="enabled")
+
+
+class ProfilingMiddleware:
+    """X-Profile başlıklı yetkili istekleri profilleyen ASGI middleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _header(scope, HEADER) is None:
+            await self.app(scope, receive, send)
+            return
+
+        mode = _header(scope, HEADER).strip().lower()
+        if mode not in MODES or _running.locked() or not await _is_authorized(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with _running:
+            await self._profile(scope, receive, send, mode)
+
+    async def _profile(self, scope, receive, send, mode):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        stem = _file_stem(scope)
+
+        async def send_with_file(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-file", stem.encode())]
+            await send(message)
+
+        sampler = _sampling_profiler() if mode == "sample" else None
+        if sampler is not None:
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_file)
+            finally:
+                sampler.stop()
+                await asyncio.to_thread(_write_sample, sampler, stem)
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_file)
+        finally:
+            profiler.disable()
+            await asyncio.to_thread(_write_cprofile, profiler, stem)
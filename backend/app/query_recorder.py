@@ -0,0 +1,110 @@
+"""
+SQL sorgu kaydedici: bir blok (ör. tek bir istek) sırasında çalışan ifadeleri toplar
+
+Sorgu bütçesi kontrolleri ve benchmark için kullanılır. Kayıt contextvar
+üzerinden yapılır; aynı süreçte eşzamanlı işlenen diğer isteklerin sorguları
+karışmaz (uygulama kaydedicinin açıldığı task içinde çalışmalıdır, ör.
+httpx.ASGITransport).
+
+    with QueryRecorder() as recorder:
+        await client.get("/api/customers")
+    recorder.check(budget=2)  # ihlaller (boşsa sorun yok)
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_current: ContextVar[Optional["QueryRecorder"]] = ContextVar("query_recorder", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"\$\d+|%\(\w+\)s|%s|\?|:\w+")
+_VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_MULTI_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+
+
+def statement_shape(statement: str) -> str:
+    """Parametre/literal değerlerinden ve IN listesi uzunluğundan bağımsız ifade şekli"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _LITERALS.sub("?", shape)
+    shape = _PARAMS.sub("?", shape)
+    shape = _VALUE_LISTS.sub("(?)", shape)
+    return _MULTI_ROWS.sub(r"\1", shape)
+
+
+@dataclass
+class RecordedQuery:
+    statement: str
+    shape: str
+    executemany: bool
+    seconds: float
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_recorder_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _current.get()
+    if recorder is None:
+        return
+    started = conn.info.get("query_recorder_started")
+    elapsed = time.perf_counter() - started.pop() if started else 0.0
+    recorder.queries.append(RecordedQuery(statement, statement_shape(statement), executemany, elapsed))
+
+
+def install(sync_engine) -> None:
+    """Engine'e kayıt event'lerini ekle (birden fazla çağrı zararsız)"""
+    from sqlalchemy import event
+
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryRecorder:
+    """`with` bloğu içinde çalışan SQL ifadelerini kaydeder"""
+
+    def __init__(self, sync_engine=None):
+        if sync_engine is None:
+            from app.database import async_engine
+            sync_engine = async_engine.sync_engine
+        install(sync_engine)
+        self.queries: List[RecordedQuery] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryRecorder":
+        self.queries = []
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current.reset(self._token)
+        self._token = None
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def seconds(self) -> float:
+        return sum(query.seconds for query in self.queries)
+
+    def repeated_shapes(self, min_count: int = 2) -> Dict[str, int]:
+        """En az `min_count` kez çalışan ifade şekilleri (N+1 belirtisi)"""
+        counts = Counter(query.shape for query in self.queries)
+        return {shape: count for shape, count in counts.items() if count >= min_count}
+
+    def check(self, budget: int, allow_repeated: bool = False) -> List[str]:
+        """Bütçe aşımı ve tekrar eden ifade şekilleri için ihlal mesajları"""
+        violations = []
+        if self.count > budget:
+            violations.append(f"{self.count} sorgu çalıştı, bütçe {budget}")
+        if not allow_repeated:
+            for shape, count in self.repeated_shapes().items():
+                violations.append(f"aynı ifade {count} kez çalıştı: {shape[:160]}")
+        return violations
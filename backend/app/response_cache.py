@@ -0,0 +1,196 @@
+"""
+İstatistik endpoint'leri için serileştirilmiş yanıt önbelleği
+
+Yanıtlar endpoint + parametre anahtarıyla JSON byte'ları olarak saklanır ve
+etiketlenir ("customers", "codes"). Müşteri/kod yazmaları ilgili etiketi
+geçersiz kılar. RESPONSE_CACHE_BACKEND:
+    memory - süreç içi; geçersiz kılma yalnızca yazan worker'ı temizler, diğer
+             worker'lar en geç RESPONSE_CACHE_MEMORY_TTL_SECONDS sonra tazelenir
+    sqlite - RESPONSE_CACHE_PATH'teki dosya; aynı makinedeki tüm worker'lar paylaşır,
+             dosya erişimi event loop'u bloklamamak için thread havuzunda yapılır
+    none   - önbellek kapalı
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from app.config import settings
+
+CUSTOMERS = "customers"
+CODES = "codes"
+
+
+def _expires_at(max_age: Optional[float] = None) -> Optional[float]:
+    ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+    if max_age is not None:
+        ttl = min(ttl, max_age) if ttl > 0 else max_age
+    return time.time() + ttl if ttl > 0 else None
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Optional[float], frozenset, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, body = entry
+        if expires_at is not None and expires_at < time.time():
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return body
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], max_age: Optional[float] = None) -> None:
+        # Başka süreçlerin yazmaları buraya ulaşmaz; kayıtlar süresiz tutulmaz
+        limit = settings.RESPONSE_CACHE_MEMORY_TTL_SECONDS
+        if limit > 0:
+            max_age = limit if max_age is None else min(max_age, limit)
+        with self._lock:
+            self._entries[key] = (_expires_at(max_age), frozenset(tags), body)
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            for key in [k for k, (_, tags, _) in self._entries.items() if tag in tags]:
+                del self._entries[key]
+
+
+class SQLiteBackend:
+    # get/set/invalidate disk ve kilit beklediğinden thread havuzunda çağrılır
+    blocking = True
+
+    def __init__(self, path: str):
+        self._path = path
+        self._local = threading.local()
+        connection = self._connection()
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(response_cache)")]
+        if "tags" in columns:
+            # Etiketleri tek kolonda tutan eski şema; içerik önbellek olduğundan atılabilir
+            connection.execute("DROP TABLE response_cache")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            " key TEXT PRIMARY KEY, expires_at REAL, body BLOB NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache_tags ("
+            " key TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (key, tag)) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_response_cache_tags_tag ON response_cache_tags (tag)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 bağlantıları thread'ler arasında paylaşılmaz
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _write(self, statements: Iterable[Tuple[str, tuple]]) -> None:
+        """Kayıt ve etiket satırlarını tek transaction'da yaz"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                connection.execute(sql, params)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT body, expires_at FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self._write([
+                ("DELETE FROM response_cache WHERE key = ?", (key,)),
+                ("DELETE FROM response_cache_tags WHERE key = ?", (key,)),
+            ])
+            return None
+        return body
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], max_age: Optional[float] = None) -> None:
+        self._write([
+            ("INSERT OR REPLACE INTO response_cache (key, expires_at, body) VALUES (?, ?, ?)",
+             (key, _expires_at(max_age), body)),
+            ("DELETE FROM response_cache_tags WHERE key = ?", (key,)),
+        ] + [
+            ("INSERT OR IGNORE INTO response_cache_tags (key, tag) VALUES (?, ?)", (key, tag))
+            for tag in tags
+        ])
+
+    def invalidate(self, tag: str) -> None:
+        # Etiketin anahtarları ix_response_cache_tags_tag ile bulunur (tablo taranmaz)
+        tagged = "SELECT key FROM response_cache_tags WHERE tag = ?"
+        self._write([
+            (f"DELETE FROM response_cache WHERE key IN ({tagged})", (tag,)),
+            (f"DELETE FROM response_cache_tags WHERE key IN ({tagged})", (tag,)),
+        ])
+
+
+def _create_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "sqlite":
+        return SQLiteBackend(settings.RESPONSE_CACHE_PATH)
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend()
+    return None
+
+
+backend = _create_backend()
+
+
+async def _call(method: Callable, *args):
+    """Backend metodunu çağır; dosyaya giden backend'lerde thread havuzunda"""
+    if backend.blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+async def invalidate(*tags: str) -> None:
+    """Etiketli tüm yanıtları sil (yazma işlemlerinin commit'inden sonra çağrılır)"""
+    if backend is None:
+        return
+    for tag in tags:
+        await _call(backend.invalidate, tag)
+
+
+async def cached_json(
+    key: str,
+    tags: Iterable[str],
+    compute: Callable[[], Awaitable[object]],
+    max_age: Optional[float] = None
+) -> Response:
+    """
+    Önbellekte varsa byte'ları doğrudan döndür, yoksa hesapla, serileştir ve sakla.
+    compute hazır JSON byte'ları döndürürse (ör. fast_json.dumps) olduğu gibi saklanır.
+    max_age verilirse kayıt TTL'den bağımsız olarak en fazla bu kadar saniye tutulur
+    (ör. replikadan, gecikmeli olabilecek veriyle hesaplanan yanıtlar).
+    """
+    if backend is not None:
+        body = await _call(backend.get, key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+    content = await compute()
+    if isinstance(content, bytes):
+        response = Response(content=content, media_type="application/json")
+    else:
+        # FastAPI'nin varsayılan JSON çıktısıyla aynı byte'lar
+        response = JSONResponse(content=jsonable_encoder(content))
+    if backend is not None:
+        await _call(backend.set, key, response.body, tags, max_age)
+    return response
@@ -0,0 +1,107 @@
+"""
+daily_revenue özet tablosunun bakımı
+
+Müşteri eklendiğinde/silindiğinde ilgili (gün, kod) satırı aynı transaction
+içinde artırılır/azaltılır; `rebuild` tabloyu customers'tan yeniden hesaplar.
+"""
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, insert, select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import dialect_insert
+from app.models import Customer, DailyRevenue
+
+NO_CODE = ""  # Kodsuz müşterilerin özet satırı
+
+
+def day_of(timestamp: datetime) -> date:
+    """Kayıt zamanının UTC günü (timezone'suz değerler UTC kabul edilir)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def day_expression(dialect_name: str, column):
+    """Veritabanında bir timestamp kolonunun UTC gününü veren ifade"""
+    if dialect_name == "postgresql":
+        return func.date(func.timezone("UTC", column))
+    return func.date(column)
+
+
+async def record(db: AsyncSession, day: date, code: Optional[str], count: int, revenue: float) -> None:
+    """(gün, kod) satırına müşteri sayısı ve gelir farkını ekle"""
+    await record_many(db, day, {code: (count, revenue)})
+
+
+async def record_many(db: AsyncSession, day: date, totals: Dict[Optional[str], Tuple[int, float]]) -> None:
+    """Aynı günün birden fazla kodu için farkları tek upsert ifadesiyle ekle"""
+    # Aynı ifadede bir satır iki kez güncellenemez (PostgreSQL); kodsuzlar tek satırda
+    merged: Dict[str, Tuple[int, float]] = {}
+    for code, (count, revenue) in totals.items():
+        previous_count, previous_revenue = merged.get(code or NO_CODE, (0, 0))
+        merged[code or NO_CODE] = (previous_count + count, previous_revenue + revenue)
+    if not merged:
+        return
+    rows = [
+        {"day": day, "code": code, "customer_count": count, "revenue": revenue}
+        for code, (count, revenue) in merged.items()
+    ]
+    upsert = dialect_insert(db.get_bind().dialect.name)
+
+    if upsert is not None:
+        stmt = upsert(DailyRevenue).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyRevenue.day, DailyRevenue.code],
+            set_={
+                "customer_count": DailyRevenue.customer_count + stmt.excluded.customer_count,
+                "revenue": DailyRevenue.revenue + stmt.excluded.revenue,
+            }
+        )
+        await db.execute(stmt)
+        return
+
+    for values in rows:
+        result = await db.execute(select(DailyRevenue).where(
+            DailyRevenue.day == values["day"],
+            DailyRevenue.code == values["code"]
+        ).with_for_update())
+        row = result.scalars().first()
+        if row is None:
+            db.add(DailyRevenue(**values))
+        else:
+            row.customer_count = DailyRevenue.customer_count + values["customer_count"]
+            row.revenue = DailyRevenue.revenue + values["revenue"]
+
+
+async def record_customer(db: AsyncSession, customer: Customer, sign: int = 1) -> None:
+    """Müşteriyi özet tabloya ekle (sign=1) ya da çıkar (sign=-1)"""
+    await record(
+        db,
+        day_of(customer.created_at),
+        customer.code,
+        sign,
+        sign * (customer.revenue or 0)
+    )
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Özet tabloyu customers tablosundan baştan hesapla; yazılan satır sayısını döner"""
+    day = day_expression(db.get_bind().dialect.name, Customer.created_at)
+    code = func.coalesce(Customer.code, NO_CODE)
+    grouped = select(
+        day,
+        code,
+        func.count(Customer.id),
+        func.coalesce(func.sum(Customer.revenue), 0)
+    ).where(
+        Customer.is_deleted == False
+    ).group_by(day, code)
+
+    await db.execute(delete(DailyRevenue))
+    result = await db.execute(
+        insert(DailyRevenue).from_select(
+            ["day", "code", "customer_count", "revenue"],
+            grouped
+        )
+    )
+    return result.rowcount
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import User
 from app.schemas import Token, LoginRequest, UserResponse
-from app.utils import verify_password, create_access_token
+from app.utils import create_access_token
+from app.password_hashing import verify_password_async
 from app.dependencies import get_current_user
+from app.user_cache import CachedUser, token_claims
 from app.config import settings
 from datetime import timedelta
 
@@ -15,12 +18,13 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı girişi"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
     
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-posta veya şifre hatalı",
@@ -29,7 +33,7 @@ async def login(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id, "email": user.email},
+        data=token_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -39,12 +43,13 @@ async def login(
 @router.post("/login-json", response_model=Token)
 async def login_json(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı girişi (JSON)"""
-    user = db.query(User).filter(User.email == login_data.email).first()
+    result = await db.execute(select(User).where(User.email == login_data.email))
+    user = result.scalars().first()
     
-    if not user or not verify_password(login_data.password, user.password):
+    if not user or not await verify_password_async(login_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-posta veya şifre hatalı",
@@ -52,7 +57,7 @@ async def login_json(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id, "email": user.email},
+        data=token_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -60,7 +65,7 @@ async def login_json(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CachedUser = Depends(get_current_user)):
     """Mevcut kullanıcı bilgilerini getir"""
     return current_user
 
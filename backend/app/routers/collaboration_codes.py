@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.database import get_db
 from app.models import CollaborationCode
 from app.schemas import CollaborationCodeCreate, CollaborationCodeUpdate, CollaborationCodeResponse
-from app.dependencies import get_current_user, require_permission
+from app.dependencies import get_current_user, get_read_db, require_permission
+from app import code_cache, response_cache
 
 router = APIRouter()
 
@@ -12,10 +14,13 @@ router = APIRouter()
 @router.get("", response_model=List[CollaborationCodeResponse])
 async def get_collaboration_codes(
     current_user = Depends(require_permission("can_manage_collaboration_codes")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Tüm işbirliği kodlarını getir"""
-    codes = db.query(CollaborationCode).order_by(CollaborationCode.created_at.desc()).all()
+    result = await db.execute(
+        select(CollaborationCode).order_by(CollaborationCode.created_at.desc())
+    )
+    codes = result.scalars().all()
     return codes
 
 
@@ -23,13 +28,14 @@ async def get_collaboration_codes(
 async def create_collaboration_code(
     code_data: CollaborationCodeCreate,
     current_user = Depends(require_permission("can_manage_collaboration_codes")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Yeni işbirliği kodu ekle"""
     # Kod zaten var mı kontrol et
-    existing_code = db.query(CollaborationCode).filter(
+    result = await db.execute(select(CollaborationCode).where(
         CollaborationCode.code == code_data.code
-    ).first()
+    ))
+    existing_code = result.scalars().first()
     
     if existing_code:
         raise HTTPException(
@@ -43,8 +49,10 @@ async def create_collaboration_code(
     )
     
     db.add(code)
-    db.commit()
-    db.refresh(code)
+    await code_cache.bump_version(db)
+    await db.commit()
+    code_cache.invalidate()
+    await response_cache.invalidate(response_cache.CODES)
     
     return code
 
@@ -54,10 +62,11 @@ async def update_collaboration_code(
     code_id: str,
     code_data: CollaborationCodeUpdate,
     current_user = Depends(require_permission("can_manage_collaboration_codes")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """İşbirliği kodunu güncelle"""
-    code = db.query(CollaborationCode).filter(CollaborationCode.id == code_id).first()
+    result = await db.execute(select(CollaborationCode).where(CollaborationCode.id == code_id))
+    code = result.scalars().first()
     
     if not code:
         raise HTTPException(
@@ -66,9 +75,11 @@ async def update_collaboration_code(
         )
     
     code.is_active = code_data.is_active
+    await code_cache.bump_version(db)
     
-    db.commit()
-    db.refresh(code)
+    await db.commit()
+    code_cache.invalidate()
+    await response_cache.invalidate(response_cache.CODES)
     
     return code
 
@@ -77,10 +88,11 @@ async def update_collaboration_code(
 async def delete_collaboration_code(
     code_id: str,
     current_user = Depends(require_permission("can_manage_collaboration_codes")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """İşbirliği kodunu sil"""
-    code = db.query(CollaborationCode).filter(CollaborationCode.id == code_id).first()
+    result = await db.execute(select(CollaborationCode).where(CollaborationCode.id == code_id))
+    code = result.scalars().first()
     
     if not code:
         raise HTTPException(
@@ -88,8 +100,11 @@ async def delete_collaboration_code(
             detail="Kod bulunamadı"
         )
     
-    db.delete(code)
-    db.commit()
+    await db.delete(code)
+    await code_cache.bump_version(db)
+    await db.commit()
+    code_cache.invalidate()
+    await response_cache.invalidate(response_cache.CODES)
     
     return {"message": "Kod silindi"}
 
@@ -1,90 +1,371 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.models import Customer, CollaborationCode
-from app.schemas import CustomerCreate, CustomerResponse
-from app.dependencies import get_current_user, require_permission
-from app.utils import parse_prices
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, or_, and_, select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from app.database import get_db, read_session
+from app.models import Customer, CustomerCamp, generate_id
+from app.schemas import CustomerCreate, CustomerResponse, BulkImportResult
+from app.dependencies import get_current_user, get_read_db, read_primary, require_permission
+from app.utils import parse_prices, camp_line_items, encode_cursor, decode_cursor, customer_search_text
+from app import rollups, code_cache, response_cache, search, fast_json
 
 router = APIRouter()
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "id", "name", "surname", "phone", "email", "grade", "camps", "prices",
+    "revenue", "code", "previous_rank", "city", "is_deleted", "deleted_reason",
+    "created_at", "updated_at",
+]
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+IMPORT_BATCH_SIZE = 500
+RESPONSE_COLUMNS = fast_json.model_columns(CustomerResponse)
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _export_rows(include_deleted: bool, fmt: str, prefer_primary: bool = False):
+    """Müşterileri sunucu tarafı cursor ile EXPORT_BATCH_SIZE'lık parçalar halinde yaz"""
+    import csv
+    import io
+    import json
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+    # Yanıt gövdesi dependency'deki session kapandıktan sonra da akabileceği
+    # için export kendi (salt okunur) session'ını açar
+    async with await read_session(prefer_primary) as db:
+        stmt = select(*[getattr(Customer, column) for column in EXPORT_COLUMNS])
+        if not include_deleted:
+            stmt = stmt.where(Customer.is_deleted == False)
+        stmt = stmt.order_by(Customer.created_at.desc(), Customer.id.desc())
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        async for batch in result.partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([[_export_value(v) for v in row] for row in batch])
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(
+                        {column: _export_value(value) for column, value in zip(EXPORT_COLUMNS, row)},
+                        ensure_ascii=False
+                    ) + "\n"
+                    for row in batch
+                )
+
+
+def _normalize_prices(prices: str) -> Tuple[str, List[float]]:
+    """Fiyatları JSON string'e çevir; (kaydedilecek string, fiyat listesi) döner"""
+    import json
+    prices_array = parse_prices(prices)
+    try:
+        # Eğer zaten JSON değilse
+        json.loads(prices)
+        return prices, prices_array
+    except json.JSONDecodeError:
+        # Comma-separated string ise array'e çevir
+        return json.dumps(prices_array), prices_array
+
+
+def _customer_values(customer_data: CustomerCreate, prices_str: str, prices_array: List[float]) -> dict:
+    """Customer satırının istekten gelen kolon değerleri"""
+    return {
+        "name": customer_data.name,
+        "surname": customer_data.surname,
+        "phone": customer_data.phone,
+        "email": customer_data.email,
+        "grade": customer_data.grade,
+        "camps": customer_data.camps,
+        "prices": prices_str,
+        "revenue": sum(prices_array),
+        "code": customer_data.code,
+        "previous_rank": customer_data.previous_rank,
+        "city": customer_data.city,
+        "search_text": customer_search_text(
+            customer_data.name,
+            customer_data.surname,
+            customer_data.email,
+            customer_data.phone,
+            customer_data.city
+        ),
+    }
+
 
 @router.get("", response_model=List[CustomerResponse])
 async def get_customers(
     include_deleted: bool = Query(False, alias="includeDeleted"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    city: Optional[str] = Query(None),
+    grade: Optional[str] = Query(None),
+    code: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None, alias="createdFrom"),
+    created_to: Optional[datetime] = Query(None, alias="createdTo"),
+    with_count: bool = Query(False, alias="withCount"),
     current_user = Depends(require_permission("can_manage_customers")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Tüm müşterileri getir"""
-    query = db.query(Customer)
+    """
+    Müşterileri sayfa sayfa getir (created_at, id üzerinden keyset sayfalama).
+
+    Sonraki sayfanın cursor'ı `X-Next-Cursor`, `withCount=true` ise filtreye
+    uyan toplam kayıt sayısı `X-Total-Count` header'ında döner. Satırlar
+    CustomerResponse kolonları olarak çekilip fast_json ile serileştirilir.
+    """
+    stmt = select(*(getattr(Customer, column) for column in RESPONSE_COLUMNS))
+    headers = {}
     if not include_deleted:
-        query = query.filter(Customer.is_deleted == False)
+        stmt = stmt.where(Customer.is_deleted == False)
+    if city is not None:
+        stmt = stmt.where(Customer.city == city)
+    if grade is not None:
+        stmt = stmt.where(Customer.grade == grade)
+    if code is not None:
+        stmt = stmt.where(Customer.code == code)
+    if created_from is not None:
+        stmt = stmt.where(Customer.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Customer.created_at <= created_to)
     
-    customers = query.order_by(Customer.created_at.desc()).all()
-    return customers
+    if with_count:
+        total = await db.scalar(stmt.with_only_columns(func.count(Customer.id)))
+        headers["X-Total-Count"] = str(total)
+    
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz cursor"
+            )
+        stmt = stmt.where(or_(
+            Customer.created_at < cursor_created_at,
+            and_(Customer.created_at == cursor_created_at, Customer.id < cursor_id)
+        ))
+    
+    # Bir fazla satır çekerek sonraki sayfa olup olmadığını anla
+    result = await db.execute(
+        stmt.order_by(Customer.created_at.desc(), Customer.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    
+    return fast_json.rows_response(RESPONSE_COLUMNS, rows, headers)
+
+
+@router.get("/export")
+async def export_customers(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    include_deleted: bool = Query(False, alias="includeDeleted"),
+    current_user = Depends(require_permission("can_manage_customers")),
+    primary: bool = Depends(read_primary),
+):
+    """Müşterileri gelirleriyle birlikte CSV ya da NDJSON olarak akış halinde dışa aktar"""
+    return StreamingResponse(
+        _export_rows(include_deleted, fmt, primary),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="customers.{fmt}"'}
+    )
+
+
+@router.get("/search", response_model=List[CustomerResponse])
+async def search_customers(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    include_deleted: bool = Query(False, alias="includeDeleted"),
+    current_user = Depends(require_permission("can_manage_customers")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Ad, soyad, e-posta, telefon ve şehirde arama yap; sonuçları alaka sırasına göre
+    sayfa sayfa (limit/offset) getir. Büyük/küçük harf ve Türkçe karakterlerden
+    bağımsızdır, kelime başından (önek) eşleşir; Postgres'te yazım hatalarını da tolere eder.
+    """
+    return await search.search_customers(db, q, limit, offset, include_deleted)
 
 
 @router.post("", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
     customer_data: CustomerCreate,
     current_user = Depends(require_permission("can_manage_customers")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Yeni müşteri ekle"""
-    # Kod kontrolü
-    if customer_data.code:
-        code_exists = db.query(CollaborationCode).filter(
-            CollaborationCode.code == customer_data.code,
-            CollaborationCode.is_active == True
-        ).first()
-        
-        if not code_exists:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Geçersiz işbirliği kodu"
-            )
+    # Kod kontrolü (aktif kodlar süreç içi önbellekte)
+    if customer_data.code and not await code_cache.is_active_code(db, customer_data.code):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz işbirliği kodu"
+        )
     
-    # Fiyatları JSON string'e çevir
-    import json
     try:
-        # Eğer zaten JSON değilse
-        json.loads(customer_data.prices)
-        prices_str = customer_data.prices
-    except json.JSONDecodeError:
-        # Comma-separated string ise array'e çevir
-        prices_array = parse_prices(customer_data.prices)
-        prices_str = json.dumps(prices_array)
+        prices_str, prices_array = _normalize_prices(customer_data.prices)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="prices: Geçersiz fiyat"
+        )
     
+    # created_at Python'da (mikrosaniyeli) üretilir: SQLite'ın CURRENT_TIMESTAMP'i saniye
+    # hassasiyetinde metin yazar ve keyset cursor'ıyla eşitlik karşılaştırması tutmaz
+    now = datetime.now(timezone.utc)
     customer = Customer(
-        name=customer_data.name,
-        surname=customer_data.surname,
-        phone=customer_data.phone,
-        email=customer_data.email,
-        grade=customer_data.grade,
-        camps=customer_data.camps,
-        prices=prices_str,
-        code=customer_data.code,
-        previous_rank=customer_data.previous_rank,
-        city=customer_data.city
+        id=generate_id(),
+        created_at=now,
+        **_customer_values(customer_data, prices_str, prices_array)
     )
     
     db.add(customer)
-    db.commit()
-    db.refresh(customer)
+    db.add_all([
+        CustomerCamp(customer_id=customer.id, position=position, camp=camp, price=price, created_at=now)
+        for position, (camp, price) in enumerate(camp_line_items(customer_data.camps, prices_array))
+    ])
+    await db.flush()
+    # Günlük özet tabloyu aynı transaction içinde güncelle
+    await rollups.record_customer(db, customer)
+    await db.commit()
+    await response_cache.invalidate(response_cache.CUSTOMERS)
     
     return customer
 
 
+def _import_rows(body: bytes, content_type: str) -> List[dict]:
+    """CSV (başlık satırlı) ya da JSON dizisi gövdesini satır sözlüklerine çevir"""
+    import csv
+    import io
+    import json
+
+    if content_type.startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        # CSV'de boş hücre opsiyonel alanlar için None demek
+        return [
+            {key: (value if value != "" else None) for key, value in row.items()}
+            for row in reader
+        ]
+
+    rows = json.loads(body)
+    if not isinstance(rows, list):
+        raise ValueError("JSON gövdesi bir dizi olmalı")
+    return rows
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_customers(
+    request: Request,
+    current_user = Depends(require_permission("can_manage_customers")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    CSV (text/csv) ya da CustomerCreate JSON dizisinden toplu müşteri ekle.
+
+    Hatalı satırlar atlanıp `errors` içinde raporlanır; geçerli satırlar
+    IMPORT_BATCH_SIZE'lık toplu INSERT'lerle tek transaction'da yazılır.
+    """
+    try:
+        raw_rows = _import_rows(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Dosya okunamadı: {e}"
+        )
+    
+    errors = []
+    valid = []
+    for row_number, raw in enumerate(raw_rows, start=1):
+        try:
+            customer_data = CustomerCreate.model_validate(raw)
+            prices_str, prices_array = _normalize_prices(customer_data.prices)
+        except ValidationError as e:
+            errors.append({"row": row_number, "detail": _validation_detail(e)})
+            continue
+        except ValueError:
+            errors.append({"row": row_number, "detail": "prices: Geçersiz fiyat"})
+            continue
+        valid.append((row_number, customer_data, prices_str, prices_array))
+    
+    # Kodlar önbellekteki aktif kod kümesinden doğrulanır
+    active_codes = await code_cache.get_active_codes(db)
+    
+    now = datetime.now(timezone.utc)
+    customer_rows = []
+    camp_rows = []
+    rollup_totals = {}
+    for row_number, customer_data, prices_str, prices_array in valid:
+        if customer_data.code and customer_data.code not in active_codes:
+            errors.append({"row": row_number, "detail": "Geçersiz işbirliği kodu"})
+            continue
+        
+        values = _customer_values(customer_data, prices_str, prices_array)
+        values.update(id=generate_id(), is_deleted=False, created_at=now)
+        customer_rows.append(values)
+        camp_rows.extend(
+            {
+                "id": generate_id(),
+                "customer_id": values["id"],
+                "position": position,
+                "camp": camp,
+                "price": price,
+                "is_deleted": False,
+                "created_at": now,
+            }
+            for position, (camp, price) in enumerate(camp_line_items(customer_data.camps, prices_array))
+        )
+        count, revenue = rollup_totals.get(customer_data.code, (0, 0))
+        rollup_totals[customer_data.code] = (count + 1, revenue + values["revenue"])
+    
+    # render_nulls: None değerli satırlar ayrı INSERT gruplarına bölünmesin (batch başına tek executemany)
+    for start in range(0, len(customer_rows), IMPORT_BATCH_SIZE):
+        await db.execute(
+            insert(Customer).execution_options(render_nulls=True),
+            customer_rows[start:start + IMPORT_BATCH_SIZE]
+        )
+    for start in range(0, len(camp_rows), IMPORT_BATCH_SIZE):
+        await db.execute(insert(CustomerCamp), camp_rows[start:start + IMPORT_BATCH_SIZE])
+    await rollups.record_many(db, rollups.day_of(now), rollup_totals)
+    await db.commit()
+    await response_cache.invalidate(response_cache.CUSTOMERS)
+    
+    errors.sort(key=lambda error: error["row"])
+    return {"inserted": len(customer_rows), "errors": errors}
+
+
 @router.delete("/{customer_id}")
 async def delete_customer(
     customer_id: str,
     reason: Optional[str] = Query("Ödeme alınmadı"),
     current_user = Depends(require_permission("can_manage_customers")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Müşteriyi sil (soft delete)"""
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    result = await db.execute(select(Customer).where(Customer.id == customer_id))
+    customer = result.scalars().first()
     
     if not customer:
         raise HTTPException(
@@ -92,11 +373,18 @@ async def delete_customer(
             detail="Müşteri bulunamadı"
         )
     
+    if not customer.is_deleted:
+        await rollups.record_customer(db, customer, sign=-1)
     customer.is_deleted = True
     customer.deleted_reason = reason
+    await db.execute(
+        update(CustomerCamp).where(
+            CustomerCamp.customer_id == customer.id
+        ).values(is_deleted=True).execution_options(synchronize_session=False)
+    )
     
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
+    await response_cache.invalidate(response_cache.CUSTOMERS)
     
     return {"message": "Müşteri silindi"}
 
@@ -1,41 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserUpdate, UserResponse
-from app.dependencies import get_current_user, require_permission
-from app.utils import get_password_hash
+from app.dependencies import get_current_user, get_read_db, require_permission
+from app.password_hashing import get_password_hash_async
+from app import user_cache, fast_json
+from app.user_cache import PERMISSIONS
 
 router = APIRouter()
 
+RESPONSE_COLUMNS = fast_json.model_columns(UserResponse)
+
 
 @router.get("", response_model=List[UserResponse])
 async def get_users(
     current_user = Depends(require_permission("can_manage_access")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Tüm kullanıcıları getir"""
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    return users
+    """Tüm kullanıcıları getir (UserResponse kolonları, fast_json ile)"""
+    result = await db.execute(
+        select(*(getattr(User, column) for column in RESPONSE_COLUMNS)).order_by(User.created_at.desc())
+    )
+    return fast_json.rows_response(RESPONSE_COLUMNS, result.all())
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
     current_user = Depends(require_permission("can_manage_access")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Yeni kullanıcı oluştur"""
     # E-posta kontrolü
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bu e-posta adresi zaten kullanılıyor"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     user = User(
         email=user_data.email,
@@ -49,8 +57,7 @@ async def create_user(
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     return user
 
@@ -60,10 +67,11 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     current_user = Depends(require_permission("can_manage_access")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı bilgilerini güncelle"""
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(
@@ -71,12 +79,15 @@ async def update_user(
             detail="Kullanıcı bulunamadı"
         )
     
+    previous_permissions = [getattr(user, permission) for permission in PERMISSIONS]
+    
     # E-posta kontrolü
     if user_data.email and user_data.email != user.email:
-        existing_user = db.query(User).filter(
+        result = await db.execute(select(User).where(
             User.email == user_data.email,
             User.id != user_id
-        ).first()
+        ))
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,7 +97,7 @@ async def update_user(
     
     # Şifre güncelleme
     if user_data.password:
-        user.password = get_password_hash(user_data.password)
+        user.password = await get_password_hash_async(user_data.password)
     
     # Yetkileri güncelle
     if user_data.can_manage_customers is not None:
@@ -102,8 +113,12 @@ async def update_user(
     if user_data.can_delete_users is not None:
         user.can_delete_users = user_data.can_delete_users
     
-    db.commit()
-    db.refresh(user)
+    # Yetki ya da şifre değiştiyse eski token'ları geçersiz kıl
+    if user_data.password or previous_permissions != [getattr(user, permission) for permission in PERMISSIONS]:
+        user.permissions_version = (user.permissions_version or 0) + 1
+    
+    await db.commit()
+    user_cache.invalidate(user.id)
     
     return user
 
@@ -112,10 +127,11 @@ async def update_user(
 async def delete_user(
     user_id: str,
     current_user = Depends(require_permission("can_manage_access")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcıyı sil"""
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(
@@ -137,8 +153,9 @@ async def delete_user(
             detail="Kullanıcı silme yetkisi yok"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user_id)
     
     return {"message": "Kullanıcı silindi"}
 
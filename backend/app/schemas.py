@@ -72,6 +72,16 @@ class CustomerResponse(CustomerBase):
         from_attributes = True
 
 
+class BulkImportError(BaseModel):
+    row: int  # 1'den başlayan satır numarası (CSV başlığı hariç)
+    detail: str
+
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    errors: List[BulkImportError]
+
+
 # Collaboration Code Schemas
 class CollaborationCodeBase(BaseModel):
     code: str
@@ -103,6 +113,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None
+    permissions_version: Optional[int] = None  # Eski token'larda yok
 
 
 class LoginRequest(BaseModel):
@@ -130,6 +141,12 @@ class CustomerRevenue(BaseModel):
         from_attributes = True
 
 
+class CampSales(BaseModel):
+    camp: str
+    customer_count: int
+    revenue: float
+
+
 class CollaborationStat(BaseModel):
     code_id: str
     code: str
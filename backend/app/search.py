@@ -0,0 +1,87 @@
+"""
+Müşteri arama: Postgres'te pg_trgm (önek + bulanık eşleşme, benzerliğe göre sıralama),
+SQLite'ta FTS5 (önek eşleşmesi, bm25 sıralaması). İkisi de yoksa LIKE taramasına düşer.
+"""
+from typing import List, Optional
+from sqlalchemy import and_, func, literal_column, or_, select, table, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Customer
+from app.utils import fold_turkish
+
+FTS_TABLE = "customers_fts"
+MAX_TERMS = 8
+
+# customer_id UNINDEXED: customers'ın örtük rowid'i VACUUM'da değişebilir, id değişmez
+_fts = table(FTS_TABLE, column("customer_id"), column("search_text"))
+
+# SQLite'ta FTS tablosunun varlığı (migration ile oluşturulur); süreç başına bir kez bakılır
+_fts_available: Optional[bool] = None
+
+
+def search_terms(query: str) -> List[str]:
+    """Arama metnini katlanmış terimlere böl"""
+    return fold_turkish(query).split()[:MAX_TERMS]
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_query(terms: List[str]) -> str:
+    """Her terim için tırnaklı önek sorgusu ("ali"* "yil"*)"""
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+async def _has_fts(db: AsyncSession) -> bool:
+    global _fts_available
+    if _fts_available is None:
+        found = await db.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        )
+        _fts_available = found is not None
+    return _fts_available
+
+
+async def search_customers(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    offset: int,
+    include_deleted: bool = False
+) -> List[Customer]:
+    """Sorguyla eşleşen müşterileri alaka sırasına göre getir"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect = db.bind.dialect.name
+    stmt = select(Customer)
+    if not include_deleted:
+        stmt = stmt.where(Customer.is_deleted == False)
+
+    if dialect == "postgresql":
+        # ILIKE ve %> (word similarity) ikisi de gin_trgm_ops index'ini kullanır
+        stmt = stmt.where(and_(*[
+            or_(
+                Customer.search_text.ilike(_like_pattern(term), escape="\\"),
+                Customer.search_text.op("%>")(term)
+            )
+            for term in terms
+        ]))
+        rank = sum(func.word_similarity(term, Customer.search_text) for term in terms)
+        stmt = stmt.order_by(rank.desc(), Customer.created_at.desc(), Customer.id.desc())
+    elif dialect == "sqlite" and await _has_fts(db):
+        stmt = stmt.join(_fts, _fts.c.customer_id == Customer.id).where(
+            literal_column(FTS_TABLE).op("MATCH")(_fts_query(terms))
+        )
+        stmt = stmt.order_by(func.bm25(literal_column(FTS_TABLE)), Customer.created_at.desc())
+    else:
+        stmt = stmt.where(and_(*[
+            Customer.search_text.like(_like_pattern(term), escape="\\") for term in terms
+        ]))
+        stmt = stmt.order_by(Customer.created_at.desc(), Customer.id.desc())
+
+    result = await db.execute(stmt.limit(limit).offset(offset))
+    return list(result.scalars().all())
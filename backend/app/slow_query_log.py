@@ -0,0 +1,134 @@
+"""
+Yavaş sorgu günlüğü (SLOW_QUERY_SECONDS > 0 ise açık)
+
+Eşiği aşan her SQL ifadesi SLOW_QUERY_LOG_PATH dosyasına tek satırlık JSON
+olarak yazılır: süre, ifade şekli (literal/parametre değerleri olmadan),
+parametrelerin tipleri, isteğin method/route'u. Parametre değerleri kişisel
+veri içerebileceği için yazılmaz.
+
+PostgreSQL'de SLOW_QUERY_EXPLAIN açıksa ifadenin planı da (EXPLAIN, ANALYZE
+olmadan; sorgu yeniden çalıştırılmaz) eklenir. Aynı ifade şekli için en fazla
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS'ta bir plan alınır.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Optional
+from app import metrics
+from app.config import settings
+from app.query_recorder import statement_shape
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_TRACKED_SHAPES = 1000
+
+logger = logging.getLogger("app.slow_query")
+logger.propagate = False
+
+_explained_at: Dict[str, float] = {}
+_explain_lock = threading.Lock()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Parametre değerleri yerine tipleri (executemany'de satır sayısı + ilk satır)"""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "first": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _should_explain(shape: str) -> bool:
+    """Aynı şekil için aralık dolduysa True (ve zamanı kaydet)"""
+    now = time.monotonic()
+    with _explain_lock:
+        last = _explained_at.get(shape)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return False
+        if len(_explained_at) >= MAX_TRACKED_SHAPES:
+            _explained_at.clear()
+        _explained_at[shape] = now
+        return True
+
+
+def _explain(conn, statement: str, parameters: Any) -> Any:
+    """
+    İfadenin PostgreSQL planı. DBAPI cursor'ı doğrudan kullanılır (event'ler
+    tekrar tetiklenmez); hata transaction'ı bozmasın diye savepoint içinde çalışır.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return {"error": f"{type(e).__name__}: {e}"}
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+    if elapsed < settings.SLOW_QUERY_SECONDS:
+        return
+
+    shape = statement_shape(statement)
+    request = metrics.current_request()
+    entry: Dict[str, Any] = {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(elapsed * 1000, 2),
+        "method": request.scope["method"] if request is not None else None,
+        "route": request.route if request is not None else None,
+        "statement": shape,
+        "parameters": parameter_shape(parameters, executemany),
+        "executemany": executemany,
+        "rowcount": getattr(cursor, "rowcount", -1),
+    }
+    if (
+        settings.SLOW_QUERY_EXPLAIN
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and shape.lstrip().upper().startswith(EXPLAINABLE)
+        and _should_explain(shape)
+    ):
+        entry["plan"] = _explain(conn, statement, parameters)
+    logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("slow_query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def install(sync_engine, path: Optional[str] = None) -> None:
+    """Engine'e yavaş sorgu event'lerini ve JSON satır dosyasını bağla"""
+    from sqlalchemy import event
+
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            path or settings.SLOW_QUERY_LOG_PATH,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=5,
+            encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.WARNING)
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
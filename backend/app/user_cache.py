@@ -0,0 +1,105 @@
+"""
+Kimliği doğrulanmış kullanıcılar için süreli (TTL) bellek içi önbellek
+
+Token'daki yetki sürümü (`pv`) önbellekteki sürümle karşılaştırılır;
+update_user/delete_user önbelleği bu süreçte anında temizler, diğer
+worker'lar en geç USER_CACHE_TTL_SECONDS sonra (ya da önbellektekinden yeni
+`pv`'li bir token gelince) değişikliği görür.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import User
+
+PERMISSIONS = (
+    "can_manage_customers",
+    "can_manage_financial",
+    "can_manage_collaboration_codes",
+    "can_view_collaboration_stats",
+    "can_manage_access",
+    "can_delete_users",
+)
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """get_current_user'ın döndürdüğü, oturumdan bağımsız kullanıcı görüntüsü"""
+    id: str
+    email: str
+    permissions_version: int
+    created_at: Optional[datetime]
+    can_manage_customers: bool = False
+    can_manage_financial: bool = False
+    can_manage_collaboration_codes: bool = False
+    can_view_collaboration_stats: bool = False
+    can_manage_access: bool = False
+    can_delete_users: bool = False
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            permissions_version=user.permissions_version or 0,
+            created_at=user.created_at,
+            **{permission: bool(getattr(user, permission)) for permission in PERMISSIONS}
+        )
+
+    @property
+    def permissions(self) -> List[str]:
+        return [permission for permission in PERMISSIONS if getattr(self, permission)]
+
+
+def token_claims(user) -> dict:
+    """
+    create_access_token'a verilecek kimlik ve yetki sürümü claim'leri.
+    Yetkiler token'a yazılmaz; her istekte güncel CachedUser'dan kontrol edilir.
+    """
+    return {
+        "sub": user.id,
+        "email": user.email,
+        "pv": user.permissions_version or 0,
+    }
+
+
+_entries: Dict[str, Tuple[float, CachedUser]] = {}
+_lock = threading.Lock()
+
+
+def invalidate(user_id: str) -> None:
+    """Kullanıcıyı önbellekten çıkar (yetki/şifre değişimi, silme)"""
+    with _lock:
+        _entries.pop(user_id, None)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[CachedUser]:
+    """Kullanıcıyı önbellekten, yoksa veritabanından getir"""
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
+    if user is None:
+        invalidate(user_id)
+        return None
+
+    cached = CachedUser.from_user(user)
+    with _lock:
+        if len(_entries) >= settings.USER_CACHE_MAX_SIZE:
+            # En eski kaydı at (dict ekleme sırasını korur)
+            _entries.pop(next(iter(_entries)))
+        _entries[user_id] = (now + settings.USER_CACHE_TTL_SECONDS, cached)
+    return cached
@@ -1,23 +1,29 @@
-from passlib.context import CryptContext
-from jose import jwt
 from datetime import datetime, timedelta
+from functools import lru_cache
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """bcrypt bağlamı; passlib ilk şifre işleminde import edilir (soğuk başlangıçta değil)"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Şifre doğrulama"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Şifre hashleme"""
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """JWT token oluştur"""
+    from jose import jwt
+    
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -30,15 +36,78 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
 
 
 def parse_prices(prices_str: str) -> list[float]:
-    """Fiyat string'ini parse et"""
+    """Fiyat string'ini parse et; sayıya çevrilemeyen fiyatta ValueError fırlatır"""
+    import json
     try:
-        import json
         parsed = json.loads(prices_str)
         if isinstance(parsed, list):
             return [float(p) for p in parsed if p]
         return [float(parsed)] if parsed else []
+    except (TypeError, OverflowError) as e:
+        # Geçerli JSON ama sayı listesi değil (ör. {"a": 1}, [[1]]) ya da float'a sığmayan sayı
+        raise ValueError(f"Geçersiz fiyat: {prices_str}") from e
     except (json.JSONDecodeError, ValueError):
         # Comma-separated string ise
         prices = [float(p.strip()) for p in prices_str.split(',') if p.strip()]
         return prices
 
+
+
+def parse_camps(camps_str: str) -> list[str]:
+    """Kamp string'ini parse et"""
+    try:
+        import json
+        parsed = json.loads(camps_str)
+        if isinstance(parsed, list):
+            return [str(c).strip() for c in parsed if str(c).strip()]
+        return [str(parsed).strip()] if parsed else []
+    except (json.JSONDecodeError, ValueError):
+        # Comma-separated string ise
+        return [c.strip() for c in camps_str.split(',') if c.strip()]
+
+
+def camp_line_items(camps_str: str, prices: list[float]) -> list[tuple[str, float]]:
+    """Kampları sıralarına göre fiyatlarıyla eşleştir (fiyatı olmayan kamp 0)"""
+    return [
+        (camp, prices[index] if index < len(prices) else 0.0)
+        for index, camp in enumerate(parse_camps(camps_str))
+    ]
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """Keyset sayfalama için (created_at, id) ikilisini opak bir cursor'a çevir"""
+    import base64
+    import json
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """encode_cursor'ın tersi; geçersiz cursor'da ValueError fırlatır"""
+    import base64
+    import json
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Geçersiz cursor") from e
+
+
+# Türkçe harflerin aksansız karşılıkları (arama için)
+_SEARCH_FOLD = str.maketrans({
+    "ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c",
+    "â": "a", "î": "i", "û": "u",
+})
+
+
+def fold_turkish(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevir ve aksanları kaldır (İ→i, I→ı→i, Ş→s ...)"""
+    text = text.replace("İ", "i").replace("I", "ı").lower()
+    return text.translate(_SEARCH_FOLD)
+
+
+def customer_search_text(name: str, surname: str, email: str, phone: str, city: str) -> str:
+    """Customer.search_text: aranabilir alanların katlanmış birleşimi"""
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    return fold_turkish(" ".join([name, surname, email, phone, digits, city]))
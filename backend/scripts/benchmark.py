@@ -0,0 +1,271 @@
+"""
+Endpoint bazında gecikme (p50/p95) ve sorgu sayısı benchmark'ı
+
+Her veri boyutu için müşteri tablosu scripts.generate_data ile hedef sayıya
+tamamlanır, ardından her endpoint uygulama içinden (ASGI, ağ yok) `--iterations`
+kez çağrılır. Sonuç JSON olarak yazılabilir ve kayıtlı bir baseline ile
+karşılaştırılabilir; p95 `--threshold` katından fazla yavaşlayan ya da sorgu
+sayısı artan endpoint varsa çıkış kodu 1 olur. Yanıt önbelleği varsayılan
+olarak kapalıdır (istatistik endpoint'lerinin sorguları ölçülsün); `--cache`
+ile açılır. Yazma endpoint'lerinin oluşturduğu kayıtlar her çağrıdan sonra
+tablodan kaldırılır, müşteri sayısı istenen boyutta kalır.
+
+Kullanım (backend/ dizininde, `alembic upgrade head` sonrası):
+    python -m scripts.benchmark --sizes 10000,100000,1000000 --output benchmark.json
+    python -m scripts.benchmark --sizes 10000 --baseline benchmark.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Yanıt önbelleği ayarlar yüklenirken seçildiği için uygulama import'larından önce.
+# Varsayılan kapalı: istatistik endpoint'leri önbellekten (0 sorgu) ölçülmesin
+if "--cache" not in sys.argv:
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.database import AsyncSessionLocal, async_engine
+from app.models import Customer, CustomerCamp
+from app.query_recorder import QueryRecorder
+from scripts.generate_data import BENCHMARK_EMAIL, BENCHMARK_PASSWORD, generate
+
+# (ad, method, path, query parametreleri, JSON gövde, tekrar sayısı çarpanı)
+Endpoint = Tuple[str, str, str, Dict[str, Any], Optional[dict], float]
+
+_now = datetime.now(timezone.utc)
+
+BENCHMARK_CUSTOMER = {
+    "name": "Benchmark", "surname": "Müşteri", "phone": "0500 000 00 00",
+    "email": "benchmark-customer@example.com", "grade": "12", "camps": "Yaz Kampı",
+    "prices": "4500", "code": "KOD001", "city": "Ankara",
+}
+BULK_SIZE = 20
+BENCHMARK_BULK = [
+    {**BENCHMARK_CUSTOMER, "email": f"benchmark-bulk-{index}@example.com", "camps": "Yaz Kampı, Kış Kampı", "prices": "4500, 3500"}
+    for index in range(BULK_SIZE)
+]
+BENCHMARK_USER = {"email": "benchmark-user@kampus.com", "password": "benchmark-user"}
+BENCHMARK_CODE = {"code": "BENCHMARK-KOD"}
+
+ENDPOINTS: List[Endpoint] = [
+    ("auth.login", "POST", "/api/auth/login-json", {}, {"email": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD}, 0.2),
+    ("auth.me", "GET", "/api/auth/me", {}, None, 1),
+    ("customers.list", "GET", "/api/customers", {}, None, 1),
+    ("customers.list_count", "GET", "/api/customers", {"withCount": "true"}, None, 1),
+    ("customers.list_city", "GET", "/api/customers", {"city": "Ankara"}, None, 1),
+    ("customers.list_code", "GET", "/api/customers", {"code": "KOD001"}, None, 1),
+    ("customers.list_recent", "GET", "/api/customers", {"createdFrom": (_now - timedelta(days=30)).isoformat()}, None, 1),
+    ("customers.search", "GET", "/api/customers/search", {"q": "ayşe yıl"}, None, 1),
+    ("customers.export", "GET", "/api/customers/export", {"format": "ndjson"}, None, 0.1),
+    ("customers.create", "POST", "/api/customers", {}, BENCHMARK_CUSTOMER, 1),
+    ("customers.bulk", "POST", "/api/customers/bulk", {}, BENCHMARK_BULK, 0.2),
+    ("customers.delete", "DELETE", "/api/customers/{customer_id}", {}, None, 1),
+    ("users.list", "GET", "/api/users", {}, None, 1),
+    ("users.create", "POST", "/api/users", {}, BENCHMARK_USER, 0.2),
+    ("users.update", "PATCH", "/api/users/{user_id}", {}, {"can_manage_customers": True}, 0.2),
+    ("users.delete", "DELETE", "/api/users/{user_id}", {}, None, 0.2),
+    ("collaboration_codes.list", "GET", "/api/collaboration-codes", {}, None, 1),
+    ("collaboration_codes.create", "POST", "/api/collaboration-codes", {}, BENCHMARK_CODE, 1),
+    ("collaboration_codes.update", "PATCH", "/api/collaboration-codes/{code_id}", {}, {"is_active": False}, 1),
+    ("collaboration_codes.delete", "DELETE", "/api/collaboration-codes/{code_id}", {}, None, 1),
+    ("collaboration_stats", "GET", "/api/collaboration-stats", {}, None, 1),
+    ("financial.stats", "GET", "/api/financial/stats", {}, None, 1),
+    ("financial.customer_revenue", "GET", "/api/financial/customer-revenue", {}, None, 0.2),
+    ("financial.camps", "GET", "/api/financial/camps", {"start": (_now - timedelta(days=90)).isoformat()}, None, 1),
+]
+
+
+# Yazma endpoint'leri için ölçüm dışı hazırlık ve temizlik: setup silinecek/güncellenecek
+# kaydı oluşturup yol parametrelerini döner, teardown isteğin oluşturduğu ya da
+# sildiği kaydı tablodan tamamen kaldırır (veri boyutu çalıştırmalar arasında sabit kalır)
+Setup = Callable[[httpx.AsyncClient, dict], Awaitable[Dict[str, str]]]
+Teardown = Callable[[httpx.AsyncClient, dict, httpx.Response, Dict[str, str]], Awaitable[None]]
+
+
+def _create_first(param: str, path: str, body: dict) -> Setup:
+    async def setup(client: httpx.AsyncClient, headers: dict) -> Dict[str, str]:
+        response = await client.post(path, json=body, headers=headers)
+        response.raise_for_status()
+        return {param: response.json()["id"]}
+    return setup
+
+
+def _delete_created(path: str) -> Teardown:
+    async def teardown(client: httpx.AsyncClient, headers: dict, response: httpx.Response, path_params: Dict[str, str]) -> None:
+        await client.delete(f"{path}/{response.json()['id']}", headers=headers)
+    return teardown
+
+
+async def _purge_customers(ids: List[str]) -> None:
+    """Silinmiş (is_deleted) benchmark müşterilerini kamp satırlarıyla birlikte tablodan kaldır"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(CustomerCamp).where(CustomerCamp.customer_id.in_(ids)))
+        await db.execute(delete(Customer).where(Customer.id.in_(ids)))
+        await db.commit()
+
+
+async def _remove_customers(client: httpx.AsyncClient, headers: dict, ids: List[str]) -> None:
+    # Önce API ile silinir (daily_revenue özeti düşülür), sonra satırlar kaldırılır
+    for customer_id in ids:
+        await client.delete(f"/api/customers/{customer_id}", headers=headers)
+    await _purge_customers(ids)
+
+
+async def _remove_created_customer(client: httpx.AsyncClient, headers: dict, response: httpx.Response, path_params: Dict[str, str]) -> None:
+    await _remove_customers(client, headers, [response.json()["id"]])
+
+
+async def _remove_bulk_customers(client: httpx.AsyncClient, headers: dict, response: httpx.Response, path_params: Dict[str, str]) -> None:
+    # Toplu içe aktarma id döndürmez; eklenenler e-posta önekinden bulunur
+    async with AsyncSessionLocal() as db:
+        ids = (await db.scalars(
+            select(Customer.id).where(Customer.email.like("benchmark-bulk-%"), Customer.is_deleted == False)
+        )).all()
+    await _remove_customers(client, headers, list(ids))
+
+
+async def _purge_deleted_customer(client: httpx.AsyncClient, headers: dict, response: httpx.Response, path_params: Dict[str, str]) -> None:
+    await _purge_customers([path_params["customer_id"]])
+
+
+SETUP: Dict[str, Setup] = {
+    "customers.delete": _create_first("customer_id", "/api/customers", BENCHMARK_CUSTOMER),
+    "users.update": _create_first("user_id", "/api/users", BENCHMARK_USER),
+    "users.delete": _create_first("user_id", "/api/users", BENCHMARK_USER),
+    "collaboration_codes.update": _create_first("code_id", "/api/collaboration-codes", BENCHMARK_CODE),
+    "collaboration_codes.delete": _create_first("code_id", "/api/collaboration-codes", BENCHMARK_CODE),
+}
+
+TEARDOWN: Dict[str, Teardown] = {
+    "customers.create": _remove_created_customer,
+    "customers.bulk": _remove_bulk_customers,
+    "customers.delete": _purge_deleted_customer,
+    "users.create": _delete_created("/api/users"),
+    "users.update": _delete_created("/api/users"),
+    "collaboration_codes.create": _delete_created("/api/collaboration-codes"),
+    "collaboration_codes.update": _delete_created("/api/collaboration-codes"),
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+async def run_endpoint(client: httpx.AsyncClient, endpoint: Endpoint, iterations: int, headers: dict) -> Dict[str, Any]:
+    name, method, path, params, body, weight = endpoint
+    runs = max(int(iterations * weight), 3)
+    latencies, queries = [], []
+    status_code = None
+    setup, teardown = SETUP.get(name), TEARDOWN.get(name)
+    for _ in range(runs):
+        path_params = await setup(client, headers) if setup else {}
+        with QueryRecorder() as recorder:
+            started = time.perf_counter()
+            response = await client.request(method, path.format(**path_params), params=params, json=body, headers=headers)
+            await response.aread()
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(recorder.count)
+        status_code = response.status_code
+        if teardown and response.status_code < 400:
+            await teardown(client, headers, response, path_params)
+    return {
+        "status": status_code,
+        "runs": runs,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "queries": int(percentile(queries, 0.50)),
+    }
+
+
+async def run_size(size: int, iterations: int) -> Dict[str, Any]:
+    from app.main import app
+
+    print(f"\n▶ {size} müşteri")
+    await generate(size)
+    async with AsyncSessionLocal() as db:
+        rows = await db.scalar(select(func.count(Customer.id)))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        login = await client.post("/api/auth/login-json", json={"email": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        results = {}
+        for endpoint in ENDPOINTS:
+            results[endpoint[0]] = result = await run_endpoint(client, endpoint, iterations, headers)
+            print(f"   {endpoint[0]:<30} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  {result['queries']} sorgu  [{result['status']}]")
+    return {"rows": rows, "endpoints": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Baseline'a göre gerilemeler"""
+    regressions = []
+    for size, run in current["sizes"].items():
+        base_run = baseline.get("sizes", {}).get(size)
+        if base_run is None:
+            continue
+        for name, result in run["endpoints"].items():
+            base = base_run["endpoints"].get(name)
+            if base is None:
+                continue
+            if result["p95_ms"] > base["p95_ms"] * threshold:
+                regressions.append(f"{size} {name}: p95 {base['p95_ms']} → {result['p95_ms']} ms")
+            if result["queries"] > base["queries"]:
+                regressions.append(f"{size} {name}: sorgu {base['queries']} → {result['queries']}")
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Endpoint gecikme ve sorgu sayısı benchmark'ı")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Virgülle ayrılmış müşteri sayıları (artan)")
+    parser.add_argument("--iterations", type=int, default=50, help="Endpoint başına istek sayısı")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Gerileme sayılacak p95 oranı")
+    parser.add_argument("--cache", action="store_true", help="Yanıt önbelleğini aç (istatistikler önbellekten ölçülür)")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "dialect": async_engine.dialect.name,
+        "iterations": args.iterations,
+        "response_cache": settings.RESPONSE_CACHE_BACKEND,
+        "sizes": {},
+    }
+    for size in sizes:
+        report["sizes"][str(size)] = await run_size(size, args.iterations)
+    await async_engine.dispose()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("response_cache") != report["response_cache"]:
+            print(f"\n⚠️  Baseline önbellek ayarı farklı ({baseline.get('response_cache')} ≠ {report['response_cache']})")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\n❌ Baseline'a göre gerilemeler:")
+            for line in regressions:
+                print("   " + line)
+            return 1
+        print("\n✅ Baseline'a göre gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
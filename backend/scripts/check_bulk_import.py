@@ -0,0 +1,96 @@
+"""
+Fiyatı hatalı satırların müşteri eklemede 400, toplu içe aktarmada satır hatası olduğunun kontrolü
+
+Geçici veritabanlı uygulamaya (scripts.temp_app) geçerli ve geçersiz fiyatlı
+satırları karışık içeren JSON ve CSV dosyaları POST /api/customers/bulk ile
+gönderilir: geçerli satırlar eklenmeli, geçersizler `errors`'ta satır numarasıyla
+raporlanmalı (500 değil). Aynı fiyatlar POST /api/customers'a tek tek gönderilince
+geçersizler 400 almalı. Beklenmeyen sonuçta çıkış kodu 1.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_bulk_import
+"""
+import asyncio
+import csv
+import io
+import sys
+
+from scripts.temp_app import temporary_app
+
+# (fiyatlar, geçerli mi)
+PRICES = [
+    ("100", True),
+    ("[[1]]", False),
+    ('{"a": 1}', False),
+    ('["a"]', False),
+    ("4500, 3500", True),
+    ("[" + "9" * 400 + "]", False),
+    ('["1200.5", 800]', True),
+    ("abc", False),
+]
+
+
+def _customer(index: int, prices: str) -> dict:
+    return {
+        "name": f"Müşteri{index}", "surname": "Toplu", "phone": f"0500 000 00 {index:02d}",
+        "email": f"bulk-{index}@example.com", "grade": "12",
+        "camps": "Yaz Kampı", "prices": prices, "code": None, "city": "Ankara",
+    }
+
+
+def _csv(rows) -> bytes:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue().encode("utf-8")
+
+
+async def check(client) -> int:
+    failures = 0
+    rows = [_customer(index, prices) for index, (prices, _) in enumerate(PRICES)]
+    expected_inserted = sum(valid for _, valid in PRICES)
+    expected_errors = [row for row, (_, valid) in enumerate(PRICES, start=1) if not valid]
+
+    uploads = {
+        "JSON": {"json": rows},
+        "CSV": {"content": _csv(rows), "headers": {"Content-Type": "text/csv"}},
+    }
+    for label, kwargs in uploads.items():
+        response = await client.post("/api/customers/bulk", **kwargs)
+        if response.status_code != 200:
+            failures += 1
+            print(f"❌ {label} toplu içe aktarma: durum kodu {response.status_code}")
+            continue
+        result = response.json()
+        error_rows = [error["row"] for error in result["errors"]]
+        if result["inserted"] != expected_inserted or error_rows != expected_errors:
+            failures += 1
+            print(f"❌ {label}: {result['inserted']} eklendi, hatalı satırlar {error_rows} "
+                  f"(beklenen {expected_inserted}, {expected_errors})")
+        else:
+            print(f"✅ {label}: {result['inserted']} satır eklendi, {error_rows} satırları hata olarak raporlandı")
+
+    for index, (prices, valid) in enumerate(PRICES):
+        response = await client.post("/api/customers", json=_customer(100 + index, prices))
+        expected_status = 201 if valid else 400
+        if response.status_code != expected_status:
+            failures += 1
+            print(f"❌ POST /api/customers prices={prices[:20]!r}: {response.status_code}, beklenen {expected_status}")
+    if not failures:
+        print(f"✅ POST /api/customers: geçersiz fiyatlar 400, geçerliler 201")
+    return failures
+
+
+async def run() -> int:
+    async with temporary_app("bulk-import-check") as client:
+        failures = await check(client)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+collaboration_totals'ın eski kod başına döngüyle aynı sonucu verdiğinin kontrolü
+
+Geçici bir SQLite veritabanına API üzerinden kodlar ve müşteriler eklenir:
+kodsuz müşteriler, silinmiş müşteriler, pasif koda bağlı müşteriler, virgüllü
+("4500, 3500") ve JSON ('["1200.5", 800]') fiyatlar. GET /api/collaboration-stats
+yanıtı, her aktif kod için müşterileri tek tek çekip parse_prices ile toplayan
+eski hesaplamayla karşılaştırılır. Ardından geçmiş tarihli müşteriler doğrudan
+tabloya yazılıp daily_revenue rollups.rebuild ile yeniden hesaplanır ve
+karşılaştırma tekrarlanır. Fark varsa çıkış kodu 1.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_collaboration_stats
+"""
+import asyncio
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from scripts.temp_app import temporary_app
+
+# (kod, fiyatlar) — kod None ise kodsuz müşteri
+CUSTOMERS = [
+    ("KOD1", "4500, 3500"),
+    ("KOD1", '["1200.5", 800]'),
+    ("KOD1", "2000"),
+    ("KOD2", "750"),
+    ("KOD2", '[3000, "1500.25", 0]'),
+    ("KOD3", "1000,2000, 3000"),
+    ("KOD4", "9999"),  # KOD4 sonradan pasif yapılır
+    (None, "4500, 3500"),
+    (None, '["250.75"]'),
+    (None, "600"),
+]
+DELETED = [0, 4, 8]  # CUSTOMERS içindeki indeksler; API ile silinir
+
+
+def _customer(index: int, code, prices: str) -> dict:
+    return {
+        "name": f"Müşteri{index}", "surname": "İstatistik", "phone": f"0500 000 00 {index:02d}",
+        "email": f"stats-{index}@example.com", "grade": "12",
+        "camps": "Yaz Kampı, Kış Kampı, Bahar Kampı", "prices": prices,
+        "code": code, "city": "Ankara",
+    }
+
+
+async def legacy_stats(db) -> Dict[str, Any]:
+    """Eski get_collaboration_stats: her aktif kod için müşterileri çekip Python'da topla"""
+    from sqlalchemy import select
+    from app.models import Customer, CollaborationCode
+    from app.utils import parse_prices
+
+    codes = (await db.execute(
+        select(CollaborationCode).where(
+            CollaborationCode.is_active == True
+        ).order_by(CollaborationCode.created_at.desc())
+    )).scalars().all()
+
+    stats = []
+    for code in codes:
+        customers = (await db.execute(
+            select(Customer).where(Customer.code == code.code, Customer.is_deleted == False)
+        )).scalars().all()
+        stats.append({
+            "code_id": code.id,
+            "code": code.code,
+            "customer_count": len(customers),
+            "total_revenue": sum(sum(parse_prices(customer.prices)) for customer in customers)
+        })
+
+    customers_without_code = (await db.execute(
+        select(Customer).where(Customer.code == None, Customer.is_deleted == False)
+    )).scalars().all()
+    return {
+        "stats": stats,
+        "without_code": {
+            "customer_count": len(customers_without_code),
+            "total_revenue": sum(sum(parse_prices(customer.prices)) for customer in customers_without_code)
+        }
+    }
+
+
+def differences(actual: Dict[str, Any], expected: Dict[str, Any]) -> List[str]:
+    def bucket(name: str, got: Dict[str, Any], want: Dict[str, Any]) -> List[str]:
+        found = []
+        if got["customer_count"] != want["customer_count"]:
+            found.append(f"{name}: customer_count {got['customer_count']} != {want['customer_count']}")
+        if not math.isclose(got["total_revenue"], want["total_revenue"], abs_tol=1e-6):
+            found.append(f"{name}: total_revenue {got['total_revenue']} != {want['total_revenue']}")
+        return found
+
+    found = []
+    got_codes = [(stat["code_id"], stat["code"]) for stat in actual["stats"]]
+    want_codes = [(stat["code_id"], stat["code"]) for stat in expected["stats"]]
+    if got_codes != want_codes:
+        found.append(f"kodlar/sıra farklı: {got_codes} != {want_codes}")
+    for got, want in zip(actual["stats"], expected["stats"]):
+        found.extend(bucket(want["code"], got, want))
+    found.extend(bucket("without_code", actual["without_code"], expected["without_code"]))
+    return found
+
+
+async def check(client) -> int:
+    from app.database import AsyncSessionLocal
+    from app.models import Customer, generate_id
+    from app.utils import parse_prices
+    from app import rollups
+
+    codes = {}
+    for code in ("KOD1", "KOD2", "KOD3", "KOD4", "KOD5"):  # KOD5: müşterisi olmayan kod
+        response = await client.post("/api/collaboration-codes", json={"code": code})
+        response.raise_for_status()
+        codes[code] = response.json()["id"]
+
+    customer_ids = []
+    for index, (code, prices) in enumerate(CUSTOMERS):
+        response = await client.post("/api/customers", json=_customer(index, code, prices))
+        response.raise_for_status()
+        customer_ids.append(response.json()["id"])
+    for index in DELETED:
+        (await client.delete(f"/api/customers/{customer_ids[index]}")).raise_for_status()
+    deactivated = await client.patch(f"/api/collaboration-codes/{codes['KOD4']}", json={"is_active": False})
+    deactivated.raise_for_status()
+
+    async def compare(label: str) -> int:
+        response = await client.get("/api/collaboration-stats")
+        response.raise_for_status()
+        async with AsyncSessionLocal() as db:
+            expected = await legacy_stats(db)
+        found = differences(response.json(), expected)
+        for difference in found:
+            print(f"❌ {label}: {difference}")
+        if not found:
+            print(f"✅ {label}: {len(expected['stats'])} kod + kodsuz müşteriler eski hesaplamayla aynı")
+        return len(found)
+
+    failures = await compare("API ile eklenen müşteriler")
+
+    # Farklı günlere yayılmış, doğrudan tabloya yazılmış müşteriler + özet tablonun yeniden hesaplanması
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        for index, (code, prices) in enumerate(CUSTOMERS * 3):
+            db.add(Customer(
+                id=generate_id(),
+                name=f"Eski{index}", surname="Kayıt", phone="0500", email=f"old-{index}@example.com",
+                grade="11", camps="Yaz Kampı", prices=prices, code=code, city="İzmir",
+                revenue=sum(parse_prices(prices)), is_deleted=index % 4 == 0,
+                created_at=now - timedelta(days=index * 17)
+            ))
+        await db.flush()
+        await rollups.rebuild(db)
+        await db.commit()
+    failures += await compare("rollups.rebuild sonrası")
+    return failures
+
+
+async def run() -> int:
+    async with temporary_app("stats-check") as client:
+        failures = await check(client)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
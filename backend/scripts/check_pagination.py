@@ -0,0 +1,80 @@
+"""
+GET /api/customers keyset sayfalamasının kontrolü
+
+Geçici bir SQLite veritabanına aynı saniyede tek tek (POST /api/customers) ve
+aynı created_at ile toplu (POST /api/customers/bulk) müşteriler eklenir.
+Liste küçük `limit`'lerle X-Next-Cursor izlenerek gezilir: her müşteri tam
+bir kez ve tek istekteki sırayla gelmeli, sayfalama bitmelidir. Aksi halde
+çıkış kodu 1.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_pagination
+"""
+import asyncio
+import sys
+from typing import List
+
+from scripts.temp_app import temporary_app
+
+PAGE_LIMITS = (1, 2, 3, 7)
+
+
+def _customer(index: int) -> dict:
+    return {
+        "name": f"Müşteri{index}", "surname": "Sayfa", "phone": f"0500 000 00 {index:02d}",
+        "email": f"page-{index}@example.com", "grade": "12",
+        "camps": "Yaz Kampı", "prices": "4500", "city": "Ankara",
+    }
+
+
+async def walk(client, limit: int, max_pages: int) -> List[str]:
+    """Cursor'ı izleyerek tüm sayfaları topla (döngüye girerse max_pages'te dur)"""
+    ids: List[str] = []
+    params = {"limit": limit}
+    for _ in range(max_pages):
+        response = await client.get("/api/customers", params=params)
+        response.raise_for_status()
+        ids.extend(customer["id"] for customer in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+        params = {"limit": limit, "cursor": cursor}
+    raise RuntimeError(f"limit={limit}: {max_pages} sayfada bitmedi (cursor ilerlemiyor)")
+
+
+async def check(client) -> int:
+    # Tek tek (aynı saniye içinde) ve toplu (hepsi aynı created_at) eklenen müşteriler
+    for index in range(5):
+        (await client.post("/api/customers", json=_customer(index))).raise_for_status()
+    bulk = await client.post("/api/customers/bulk", json=[_customer(10 + index) for index in range(6)])
+    bulk.raise_for_status()
+
+    expected = [customer["id"] for customer in (await client.get("/api/customers")).json()]
+    failures = 0
+    for limit in PAGE_LIMITS:
+        try:
+            ids = await walk(client, limit, max_pages=len(expected) + 2)
+        except RuntimeError as e:
+            failures += 1
+            print(f"❌ {e}")
+            continue
+        if ids != expected:
+            failures += 1
+            print(f"❌ limit={limit}: {len(ids)} kayıt ({len(set(ids))} farklı), beklenen {len(expected)}")
+        else:
+            print(f"✅ limit={limit}: {len(ids)} kayıt, tekrar/atlama yok")
+    return failures
+
+
+async def run() -> int:
+    async with temporary_app("pagination-check") as client:
+        failures = await check(client)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
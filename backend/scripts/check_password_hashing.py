@@ -0,0 +1,82 @@
+"""
+Şifre hash havuzunun kabul/zaman aşımı sayaçlarını kontrol et
+
+Tek worker, 3'lük sıra ve işten kısa zaman aşımıyla bir istek patlaması
+gönderilir: bir kısmı 503 (sıra dolu ya da zaman aşımı) alır. Patlama
+bittikten sonra sıra derinliği ve çalışan iş sayısı sıfıra dönmeli, havuz
+yeni istekleri yeniden kabul etmelidir. Aksi halde çıkış kodu 1.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_password_hashing
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app import password_hashing
+
+JOB_SECONDS = 0.5
+BURST = 6
+
+
+def slow_job(value: int) -> int:
+    """bcrypt yerine süresi belli bir iş"""
+    time.sleep(JOB_SECONDS)
+    return value
+
+
+async def burst():
+    async def one(value: int):
+        try:
+            return await password_hashing._run(slow_job, value)
+        except HTTPException as exc:
+            return exc.status_code
+    return await asyncio.gather(*(one(i) for i in range(BURST)))
+
+
+async def run() -> int:
+    settings.PASSWORD_HASH_WORKERS = 1
+    settings.PASSWORD_HASH_MAX_QUEUE = 3
+    settings.PASSWORD_HASH_TIMEOUT_SECONDS = 0.3
+
+    results = await burst()
+    print(f"Patlama: {BURST} istek -> {results}")
+    # Havuzda hâlâ çalışan işin bitmesini bekle
+    await asyncio.sleep(JOB_SECONDS * 2)
+    stats = password_hashing.hashing_stats()
+    print(f"Sonra: queue_depth={stats['queue_depth']} running={stats['running']} "
+          f"timed_out={stats['timed_out']} rejected={stats['rejected']}")
+
+    failures = []
+    if 503 not in results:
+        failures.append("patlamada 503 bekleniyordu")
+    if stats["queue_depth"] != 0 or stats["running"] != 0:
+        failures.append("patlama bittikten sonra sayaçlar sıfıra dönmedi")
+
+    # Sıra + worker kadar iş zaman aşımına uğramadan kabul edilmeli
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+    settings.PASSWORD_HASH_TIMEOUT_SECONDS = JOB_SECONDS * (capacity + 1)
+    accepted = await asyncio.gather(*(password_hashing._run(slow_job, i) for i in range(capacity)))
+    if accepted != list(range(capacity)):
+        failures.append(f"boşalan havuz yeni işleri kabul etmedi: {accepted}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Sayaçlar doğru, havuz kapasitesi korunuyor")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    try:
+        return asyncio.run(run())
+    except HTTPException as exc:
+        print(f"❌ Boşalan havuz isteği reddetti: {exc.status_code}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
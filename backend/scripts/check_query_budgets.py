@@ -0,0 +1,164 @@
+"""
+Endpoint başına SQL sorgu bütçesi kontrolü (N+1 gerilemelerini yakalamak için)
+
+Geçici bir SQLite veritabanı oluşturulur, birkaç kod/müşteri ile doldurulur ve
+her endpoint uygulama içinden (ASGI) çağrılır. İstek sırasında çalışan
+ifadeler app.query_recorder ile kaydedilir; sorgu sayısı QUERY_BUDGETS'taki
+bütçeyi aşarsa ya da aynı ifade şekli birden fazla kez çalışırsa (N+1) çıkış
+kodu 1 olur. Kullanıcı/kod önbellekleri her istekten önce temizlenir, yanıt
+önbelleği kapalıdır; yani ölçülen sayılar en kötü (soğuk önbellek) durumdur.
+Bütçesi tanımlanmamış bir endpoint de hata sayılır.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_query_budgets
+"""
+import asyncio
+import sys
+from typing import Dict, List, NamedTuple
+
+from scripts.temp_app import admin_credentials, temporary_app
+
+
+class Budget(NamedTuple):
+    queries: int
+    allow_repeated: bool = False  # Aynı şekil farklı satırlar için bilerek tekrar ediyorsa
+
+
+# "METHOD /route şablonu" -> bütçe
+QUERY_BUDGETS: Dict[str, Budget] = {
+    "GET /": Budget(0),
+    "GET /api/health": Budget(0),
+    "GET /api/health/password-hashing": Budget(0),
+    "GET /api/health/database-pool": Budget(0),
+    "POST /api/auth/login": Budget(1),
+    "POST /api/auth/login-json": Budget(1),
+    "GET /api/auth/me": Budget(1),
+    "GET /api/customers": Budget(3),
+    "GET /api/customers/export": Budget(2),
+    "GET /api/customers/search": Budget(3),
+    "POST /api/customers": Budget(6),
+    "POST /api/customers/bulk": Budget(6),
+    "DELETE /api/customers/{customer_id}": Budget(5),
+    "GET /api/users": Budget(2),
+    "POST /api/users": Budget(3),
+    "PATCH /api/users/{user_id}": Budget(3, allow_repeated=True),  # Oturum sahibi + hedef kullanıcı,
+    "DELETE /api/users/{user_id}": Budget(3, allow_repeated=True),  # Oturum sahibi + hedef kullanıcı,
+    "GET /api/collaboration-codes": Budget(2),
+    "POST /api/collaboration-codes": Budget(4),
+    "PATCH /api/collaboration-codes/{code_id}": Budget(4),
+    "DELETE /api/collaboration-codes/{code_id}": Budget(4),
+    "GET /api/collaboration-stats": Budget(4),
+    "GET /api/financial/stats": Budget(2),
+    "GET /api/financial/customer-revenue": Budget(2),
+    "GET /api/financial/camps": Budget(2),
+}
+
+APP_NAME = "budget-check"
+ADMIN_EMAIL, ADMIN_PASSWORD = admin_credentials(APP_NAME)
+
+
+def _customer(index: int, code=None) -> dict:
+    return {
+        "name": f"Müşteri{index}", "surname": "Bütçe", "phone": f"0500 000 00 {index:02d}",
+        "email": f"budget-{index}@example.com", "grade": "12",
+        "camps": '["Yaz Kampı", "Kış Kampı"]', "prices": "4500, 3500",
+        "code": code, "city": "Ankara",
+    }
+
+
+async def check(client) -> int:
+    import httpx
+    from app.main import app
+    from app.query_recorder import QueryRecorder
+    from app import code_cache, user_cache
+
+    # N+1'in görünmesi için birden fazla kod ve müşteri
+    for code in ("KOD1", "KOD2", "KOD3"):
+        await client.post("/api/collaboration-codes", json={"code": code})
+    for index in range(6):
+        await client.post("/api/customers", json=_customer(index, ("KOD1", "KOD2", None)[index % 3]))
+
+    measured: Dict[str, List[str]] = {}
+    failures = 0
+
+    async def call(key: str, method: str, path: str, **kwargs) -> httpx.Response:
+        nonlocal failures
+        user_cache.clear()
+        code_cache.invalidate()
+        with QueryRecorder() as recorder:
+            response = await client.request(method, path, **kwargs)
+            await response.aread()
+        budget = QUERY_BUDGETS.get(key)
+        if budget is None:
+            violations = ["bütçe tanımlı değil"]
+        else:
+            violations = recorder.check(budget.queries, budget.allow_repeated)
+        if response.status_code >= 400:
+            violations.append(f"beklenmeyen durum kodu {response.status_code}")
+        measured.setdefault(key, [])
+        if violations:
+            failures += 1
+            print(f"❌ {key}: {recorder.count} sorgu")
+            for violation in violations:
+                print(f"   {violation}")
+            for query in recorder.queries:
+                print(f"     · {query.shape[:160]}")
+        else:
+            print(f"✅ {key}: {recorder.count}/{budget.queries} sorgu")
+        return response
+
+    await call("GET /", "GET", "/")
+    await call("GET /api/health", "GET", "/api/health")
+    await call("GET /api/health/password-hashing", "GET", "/api/health/password-hashing")
+    await call("GET /api/health/database-pool", "GET", "/api/health/database-pool")
+    await call("POST /api/auth/login", "POST", "/api/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    await call("POST /api/auth/login-json", "POST", "/api/auth/login-json", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    await call("GET /api/auth/me", "GET", "/api/auth/me")
+
+    await call("GET /api/customers", "GET", "/api/customers", params={"withCount": "true", "limit": 2})
+    await call("GET /api/customers/export", "GET", "/api/customers/export", params={"format": "ndjson"})
+    await call("GET /api/customers/search", "GET", "/api/customers/search", params={"q": "müşteri"})
+    created = await call("POST /api/customers", "POST", "/api/customers", json=_customer(50, "KOD1"))
+    await call("POST /api/customers/bulk", "POST", "/api/customers/bulk",
+               json=[_customer(60 + index, ("KOD1", "KOD2", None)[index % 3]) for index in range(6)])
+    await call("DELETE /api/customers/{customer_id}", "DELETE", f"/api/customers/{created.json()['id']}")
+
+    await call("GET /api/users", "GET", "/api/users")
+    user = await call("POST /api/users", "POST", "/api/users", json={"email": "budget-user@kampus.com", "password": "x"})
+    await call("PATCH /api/users/{user_id}", "PATCH", f"/api/users/{user.json()['id']}", json={"can_manage_customers": True})
+    await call("DELETE /api/users/{user_id}", "DELETE", f"/api/users/{user.json()['id']}")
+
+    await call("GET /api/collaboration-codes", "GET", "/api/collaboration-codes")
+    code = await call("POST /api/collaboration-codes", "POST", "/api/collaboration-codes", json={"code": "KOD9"})
+    await call("PATCH /api/collaboration-codes/{code_id}", "PATCH", f"/api/collaboration-codes/{code.json()['id']}", json={"is_active": False})
+    await call("DELETE /api/collaboration-codes/{code_id}", "DELETE", f"/api/collaboration-codes/{code.json()['id']}")
+
+    await call("GET /api/collaboration-stats", "GET", "/api/collaboration-stats")
+    await call("GET /api/financial/stats", "GET", "/api/financial/stats")
+    await call("GET /api/financial/customer-revenue", "GET", "/api/financial/customer-revenue")
+    await call("GET /api/financial/camps", "GET", "/api/financial/camps")
+
+    # Şemadaki her endpoint ölçülmüş olmalı
+    for path, operations in app.openapi()["paths"].items():
+        for method in operations:
+            key = f"{method.upper()} {path}"
+            if key not in measured:
+                failures += 1
+                print(f"❌ {key}: kontrol edilmedi (QUERY_BUDGETS ve çağrı listesine ekleyin)")
+
+    print(f"\n{len(measured)} endpoint kontrol edildi, {failures} ihlal")
+    return failures
+
+
+async def run() -> int:
+    async with temporary_app(APP_NAME) as client:
+        failures = await check(client)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Router'ların çalıştırdığı sorguların planlarını kontrol et; büyük bir tabloda
+sıralı tarama (sequential scan) yapan sorgu varsa çıkış kodu 1 olur.
+
+Endpoint'ler uygulama içinden (ASGI) çağrılır, çalışan her SELECT yakalanır ve
+aynı parametrelerle EXPLAIN edilir:
+- PostgreSQL: `enable_seqscan = off` ile; planlayıcı buna rağmen Seq Scan
+  seçiyorsa kullanılabilir index yoktur (tablo boyutundan bağımsız sonuç).
+- SQLite: EXPLAIN QUERY PLAN içindeki index'siz `SCAN <tablo>` satırları.
+
+Veritabanı migration'larla oluşturulmuş olmalıdır (`alembic upgrade head`).
+
+Kullanım (backend/ dizininde):
+    python -m scripts.check_query_plans
+"""
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+# Önbellekten dönen yanıtlar sorgu çalıştırmaz; planlar için kapatılır
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+import httpx
+from sqlalchemy import event
+
+from app.main import app
+from app.database import async_engine
+from app.dependencies import get_current_user
+from app.user_cache import CachedUser, PERMISSIONS
+from app.utils import encode_cursor
+
+# Sıralı taranmasında sakınca olmayan küçük tablolar
+SMALL_TABLES = {"users", "collaboration_codes", "cache_versions", "daily_revenue", "sqlite_master"}
+
+_now = datetime.now(timezone.utc)
+_cursor = encode_cursor(_now, "ffffffff-ffff-ffff-ffff-ffffffffffff")
+
+REQUESTS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("GET", "/api/customers", {}),
+    ("GET", "/api/customers", {"withCount": "true"}),
+    ("GET", "/api/customers", {"cursor": _cursor}),
+    ("GET", "/api/customers", {"city": "Ankara"}),
+    ("GET", "/api/customers", {"code": "KOD"}),
+    ("GET", "/api/customers", {"grade": "12"}),
+    ("GET", "/api/customers", {"createdFrom": (_now - timedelta(days=7)).isoformat()}),
+    ("GET", "/api/customers/export", {"format": "ndjson"}),
+    ("GET", "/api/customers/search", {"q": "ali"}),
+    ("GET", "/api/collaboration-stats", {}),
+    ("GET", "/api/collaboration-codes", {}),
+    ("GET", "/api/financial/stats", {}),
+    ("GET", "/api/financial/customer-revenue", {}),
+    ("GET", "/api/financial/camps", {}),
+    ("GET", "/api/financial/camps", {"start": (_now - timedelta(days=30)).isoformat()}),
+    ("GET", "/api/users", {}),
+    ("DELETE", "/api/customers/00000000-0000-0000-0000-000000000000", {}),
+]
+
+
+async def _plan_check_user() -> CachedUser:
+    return CachedUser(
+        id="query-plan-check",
+        email="query-plan-check@kampus.com",
+        permissions_version=0,
+        created_at=None,
+        **{permission: True for permission in PERMISSIONS}
+    )
+
+
+async def capture_statements() -> Dict[str, Tuple[str, Any]]:
+    """REQUESTS'i çalıştır; {statement: (endpoint, parametreler)} döner"""
+    captured: Dict[str, Tuple[str, Any]] = {}
+    current = {"endpoint": ""}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and statement not in captured:
+            captured[statement] = (current["endpoint"], parameters)
+
+    app.dependency_overrides[get_current_user] = _plan_check_user
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://plan-check") as client:
+            for method, path, params in REQUESTS:
+                current["endpoint"] = f"{method} {path}"
+                response = await client.request(method, path, params=params)
+                if response.status_code >= 500:
+                    raise RuntimeError(f"{method} {path}: {response.status_code} {response.text}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        app.dependency_overrides.pop(get_current_user, None)
+    return captured
+
+
+def _postgres_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(_postgres_seq_scans(child))
+    return found
+
+
+async def sequential_scans(conn, statement: str, parameters: Any) -> Tuple[List[str], List[str]]:
+    """(taranan tablolar, okunabilir plan satırları)"""
+    if conn.dialect.name == "postgresql":
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        document = result.scalar()
+        if isinstance(document, str):
+            document = json.loads(document)
+        plan = document[0]["Plan"]
+        return _postgres_seq_scans(plan), [json.dumps(plan, indent=2)]
+
+    rows = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)).all()
+    details = [row[-1] for row in rows]
+    tables = []
+    for detail in details:
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and "INDEX" not in words and words[1] != "CONSTANT":
+            tables.append(words[1])
+    return tables, details
+
+
+async def main() -> int:
+    captured = await capture_statements()
+
+    failures = 0
+    async with async_engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, (endpoint, parameters) in captured.items():
+            tables, plan = await sequential_scans(conn, statement, parameters)
+            offending = [table for table in tables if table not in SMALL_TABLES]
+            if offending:
+                failures += 1
+                print(f"❌ {endpoint}: sıralı tarama ({', '.join(offending)})")
+                print("   " + " ".join(statement.split()))
+                for line in plan:
+                    print("   " + line)
+            else:
+                print(f"✅ {endpoint}: {' '.join(statement.split())[:80]}")
+    await async_engine.dispose()
+
+    print(f"\n{len(captured)} sorgu kontrol edildi, {failures} sorguda sıralı tarama var")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,182 @@
+"""
+Benchmark ve kapasite testleri için sentetik veri üret
+
+Müşteriler son `--days` güne yayılmış kayıt tarihleri, şehirler, sınıflar,
+kamplar, fiyatlar ve işbirliği kodlarıyla toplu (executemany) eklenir;
+ardından daily_revenue özeti yeniden hesaplanır. `--customers` hedef toplamdır:
+tabloda zaten bu kadar müşteri varsa yalnızca eksik kısım eklenir.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.generate_data --customers 100000
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import func, insert, select
+
+from app.database import AsyncSessionLocal, async_engine
+from app.models import CollaborationCode, Customer, CustomerCamp, User
+from app.user_cache import PERMISSIONS
+from app.utils import customer_search_text, get_password_hash
+from app import code_cache, response_cache, rollups
+
+BENCHMARK_EMAIL = "benchmark@kampus.com"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+NAMES = [
+    "Ahmet", "Mehmet", "Ayşe", "Fatma", "Ali", "Zeynep", "Elif", "Mustafa", "Emre", "Büşra",
+    "Can", "Deniz", "Ece", "Gökhan", "Hülya", "İrem", "Kaan", "Merve", "Oğuz", "Şule",
+]
+SURNAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan",
+    "Kılıç", "Aslan", "Çetin", "Koç", "Kurt", "Özdemir", "Işık", "Ünal", "Acar", "Polat",
+]
+CITIES = [
+    "İstanbul", "Ankara", "İzmir", "Bursa", "Antalya", "Konya", "Adana", "Gaziantep",
+    "Kayseri", "Eskişehir", "Trabzon", "Samsun", "Diyarbakır", "Mersin", "Kocaeli",
+]
+GRADES = ["9", "10", "11", "12", "Mezun"]
+CAMPS = {
+    "Yaz Kampı": 4500.0,
+    "Kış Kampı": 3500.0,
+    "YKS Hazırlık": 7500.0,
+    "Deneme Kampı": 1200.0,
+    "Hafta Sonu Kampı": 900.0,
+}
+CODE_RATIO = 0.4  # İşbirliği koduyla gelen müşteri oranı
+DELETED_RATIO = 0.03  # Silinmiş müşteri oranı
+
+
+def _uuid(rng: random.Random) -> str:
+    """Seed'e bağlı (tekrarlanabilir) uuid4"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def fake_customer(rng: random.Random, index: int, codes: List[str], now: datetime, days: int) -> Tuple[dict, List[dict]]:
+    """(customers satırı, customer_camps satırları)"""
+    customer_id = _uuid(rng)
+    name = rng.choice(NAMES)
+    surname = rng.choice(SURNAMES)
+    email = f"{customer_id[:8]}.{index}@example.com"
+    phone = f"05{rng.randint(30, 59)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}"
+    city = rng.choice(CITIES)
+    camps = rng.sample(list(CAMPS), rng.choices([1, 2, 3], weights=[6, 3, 1])[0])
+    prices = [CAMPS[camp] * rng.choice([0.8, 0.9, 1.0, 1.0, 1.0]) for camp in camps]
+    created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+    is_deleted = rng.random() < DELETED_RATIO
+
+    customer = {
+        "id": customer_id,
+        "name": name,
+        "surname": surname,
+        "phone": phone,
+        "email": email,
+        "grade": rng.choice(GRADES),
+        "camps": json.dumps(camps, ensure_ascii=False),
+        "prices": json.dumps(prices),
+        "revenue": sum(prices),
+        "code": rng.choice(codes) if codes and rng.random() < CODE_RATIO else None,
+        "previous_rank": str(rng.randint(1000, 500000)) if rng.random() < 0.3 else None,
+        "city": city,
+        "search_text": customer_search_text(name, surname, email, phone, city),
+        "is_deleted": is_deleted,
+        "deleted_reason": "Sentetik veri" if is_deleted else None,
+        "created_at": created_at,
+    }
+    line_items = [
+        {
+            "id": _uuid(rng),
+            "customer_id": customer_id,
+            "position": position,
+            "camp": camp,
+            "price": price,
+            "is_deleted": is_deleted,
+            "created_at": created_at,
+        }
+        for position, (camp, price) in enumerate(zip(camps, prices))
+    ]
+    return customer, line_items
+
+
+async def ensure_codes(db, count: int) -> List[str]:
+    """KOD001.. biçiminde `count` aktif işbirliği kodu olmasını sağla"""
+    wanted = [f"KOD{number:03d}" for number in range(1, count + 1)]
+    existing = set((await db.execute(
+        select(CollaborationCode.code).where(CollaborationCode.code.in_(wanted))
+    )).scalars())
+    missing = [code for code in wanted if code not in existing]
+    if missing:
+        await db.execute(insert(CollaborationCode), [
+            {"id": str(uuid.uuid4()), "code": code, "is_active": True} for code in missing
+        ])
+        await code_cache.bump_version(db)
+    return wanted
+
+
+async def ensure_benchmark_user(db) -> None:
+    """Benchmark'ın giriş yaptığı, tüm yetkilere sahip kullanıcı"""
+    exists = await db.scalar(select(User.id).where(User.email == BENCHMARK_EMAIL))
+    if exists is None:
+        db.add(User(
+            email=BENCHMARK_EMAIL,
+            password=get_password_hash(BENCHMARK_PASSWORD),
+            **{permission: True for permission in PERMISSIONS}
+        ))
+
+
+async def generate(customers: int, codes: int = 25, days: int = 730, seed: int = 42, batch_size: int = 5000) -> int:
+    """Müşteri sayısını `customers`'a tamamla; eklenen müşteri sayısını döner"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    async with AsyncSessionLocal() as db:
+        code_list = await ensure_codes(db, codes)
+        await ensure_benchmark_user(db)
+        await db.commit()
+
+        existing = await db.scalar(select(func.count(Customer.id)))
+        # Tamamlama çalıştırmalarında aynı id'ler tekrar üretilmesin
+        rng.seed(seed + existing)
+        to_insert = max(customers - existing, 0)
+
+        inserted = 0
+        while inserted < to_insert:
+            rows, line_items = [], []
+            for index in range(existing + inserted, existing + min(inserted + batch_size, to_insert)):
+                customer, items = fake_customer(rng, index, code_list, now, days)
+                rows.append(customer)
+                line_items.extend(items)
+            await db.execute(insert(Customer), rows)
+            await db.execute(insert(CustomerCamp), line_items)
+            await db.commit()
+            inserted += len(rows)
+            print(f"   {existing + inserted}/{customers} müşteri")
+
+        if inserted:
+            await rollups.rebuild(db)
+            await db.commit()
+    await response_cache.invalidate(response_cache.CUSTOMERS, response_cache.CODES)
+    return inserted
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Sentetik müşteri verisi üret")
+    parser.add_argument("--customers", type=int, required=True, help="Hedef toplam müşteri sayısı")
+    parser.add_argument("--codes", type=int, default=25, help="İşbirliği kodu sayısı")
+    parser.add_argument("--days", type=int, default=730, help="Kayıt tarihlerinin yayıldığı gün sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    inserted = await generate(args.customers, args.codes, args.days, args.seed, args.batch_size)
+    print(f"✅ {inserted} müşteri eklendi")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,233 @@
+"""
+Çalışan bir API'ye (ör. yerel uvicorn) eşzamanlı yük testi
+
+seed.py'deki kullanıcılarla giriş yapılır; her sanal kullanıcı bir yetki
+profiline bağlanır ve o profilin yapabildiği çağrılardan ağırlıklı rastgele
+seçim yapar (müşteri listeleme/oluşturma/arama, istatistik sorgulama, kod
+açıp kapatma). Sonunda toplam ve çağrı bazında throughput, gecikme
+yüzdelikleri ve hata oranları raporlanır.
+
+Kullanım (backend/ dizininde; sunucu ayrı çalışıyor, seed.py uygulanmış):
+    uvicorn app.main:app --workers 4 --port 8000
+    python -m scripts.load_test --url http://localhost:8000 --concurrency 50 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from seed import users_data
+
+# (ad, ağırlık, gereken yetki; None = her kullanıcı)
+ACTIONS: List[Tuple[str, int, Optional[str]]] = [
+    ("customers.list", 35, "can_manage_customers"),
+    ("customers.search", 10, "can_manage_customers"),
+    ("customers.create", 8, "can_manage_customers"),
+    ("collaboration_stats", 15, "can_view_collaboration_stats"),
+    ("financial.stats", 15, "can_manage_financial"),
+    ("financial.customer_revenue", 2, "can_manage_financial"),
+    ("collaboration_codes.toggle", 3, "can_manage_collaboration_codes"),
+    ("users.list", 2, "can_manage_access"),
+    ("auth.me", 10, None),
+]
+
+CITIES = ["İstanbul", "Ankara", "İzmir", "Bursa", "Antalya"]
+SEARCH_TERMS = ["ali", "ayşe yıl", "kaya", "ankara", "0532"]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+class Results:
+    """Çağrı bazında gecikme ve durum kodu kayıtları"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, action: str, latency_ms: float, status: str) -> None:
+        self.latencies[action].append(latency_ms)
+        self.statuses[action][status] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        def stats(latencies: List[float], statuses: Counter) -> Dict[str, Any]:
+            total = sum(statuses.values())
+            errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+            return {
+                "requests": total,
+                "rps": round(total / elapsed, 1),
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "error_rate": round(errors / total, 4) if total else 0.0,
+                "statuses": dict(statuses),
+            }
+
+        all_latencies = [latency for values in self.latencies.values() for latency in values]
+        all_statuses = sum(self.statuses.values(), Counter())
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "total": stats(all_latencies, all_statuses) if all_latencies else {},
+            "actions": {
+                action: stats(self.latencies[action], self.statuses[action])
+                for action in sorted(self.latencies)
+            },
+        }
+
+
+class Session:
+    """Bir seed kullanıcısı adına giriş yapmış istemci"""
+
+    def __init__(self, client: httpx.AsyncClient, profile: dict, token: str, codes: List[dict]):
+        self.client = client
+        self.profile = profile
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.codes = codes
+        self.actions = [
+            (name, weight) for name, weight, permission in ACTIONS
+            if permission is None or profile.get(permission)
+        ]
+
+    def pick(self, rng: random.Random) -> str:
+        names, weights = zip(*self.actions)
+        return rng.choices(names, weights=weights)[0]
+
+    def get(self, path: str, **params):
+        return self.client.get(path, params=params, headers=self.headers)
+
+    async def call(self, action: str, rng: random.Random) -> httpx.Response:
+        if action == "customers.list":
+            params = {"limit": 50}
+            if rng.random() < 0.3:
+                params["city"] = rng.choice(CITIES)
+            return await self.get("/api/customers", **params)
+        if action == "customers.search":
+            return await self.get("/api/customers/search", q=rng.choice(SEARCH_TERMS))
+        if action == "customers.create":
+            return await self.client.post("/api/customers", headers=self.headers, json={
+                "name": "Yük", "surname": "Testi", "phone": "0500 000 00 00",
+                "email": f"load-{uuid.uuid4().hex[:12]}@example.com", "grade": "12",
+                "camps": "Yaz Kampı", "prices": "4500", "city": rng.choice(CITIES),
+            })
+        if action == "collaboration_stats":
+            return await self.get("/api/collaboration-stats")
+        if action == "financial.stats":
+            return await self.get("/api/financial/stats")
+        if action == "financial.customer_revenue":
+            return await self.get("/api/financial/customer-revenue")
+        if action == "collaboration_codes.toggle":
+            if not self.codes:
+                return await self.get("/api/collaboration-codes")
+            code = rng.choice(self.codes)
+            code["is_active"] = not code["is_active"]
+            return await self.client.patch(
+                f"/api/collaboration-codes/{code['id']}",
+                json={"is_active": code["is_active"]},
+                headers=self.headers
+            )
+        if action == "users.list":
+            return await self.get("/api/users")
+        return await self.get("/api/auth/me")
+
+
+async def login(client: httpx.AsyncClient, profile: dict) -> str:
+    response = await client.post(
+        "/api/auth/login-json",
+        json={"email": profile["email"], "password": profile["password"]}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def worker(session: Session, results: Results, deadline: float, seed: int) -> None:
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        action = session.pick(rng)
+        started = time.perf_counter()
+        try:
+            response = await session.call(action, rng)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results.record(action, (time.perf_counter() - started) * 1000, status)
+
+
+async def run(url: str, concurrency: int, duration: float, seed: int) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        tokens = {}
+        for profile in users_data:
+            tokens[profile["email"]] = await login(client, profile)
+
+        # Kod açıp kapatma için başlangıç durumları (test sonunda geri yüklenir)
+        admin = next(profile for profile in users_data if profile["can_manage_collaboration_codes"])
+        admin_headers = {"Authorization": f"Bearer {tokens[admin['email']]}"}
+        original = (await client.get("/api/collaboration-codes", headers=admin_headers)).json()
+        codes = [{"id": code["id"], "is_active": code["is_active"]} for code in original]
+
+        sessions = [
+            Session(client, users_data[index % len(users_data)], tokens[users_data[index % len(users_data)]["email"]], codes)
+            for index in range(concurrency)
+        ]
+        results = Results()
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*[
+            worker(session, results, deadline, seed + index)
+            for index, session in enumerate(sessions)
+        ])
+        elapsed = time.monotonic() - started
+
+        for code in original:
+            await client.patch(
+                f"/api/collaboration-codes/{code['id']}",
+                json={"is_active": code["is_active"]},
+                headers=admin_headers
+            )
+    return results.summary(elapsed)
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    total = summary["total"]
+    print(f"\n{summary['elapsed_s']} sn, {total['requests']} istek, {total['rps']} istek/sn, hata oranı %{total['error_rate'] * 100:.2f}")
+    print(f"p50 {total['p50_ms']} ms  p95 {total['p95_ms']} ms  p99 {total['p99_ms']} ms\n")
+    print(f"{'çağrı':<30}{'istek':>8}{'rps':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'hata':>8}")
+    for action, stats in summary["actions"].items():
+        print(
+            f"{action:<30}{stats['requests']:>8}{stats['rps']:>8}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+            f"{stats['error_rate'] * 100:>7.2f}%"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Eşzamanlı API yük testi")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="Sanal kullanıcı sayısı")
+    parser.add_argument("--duration", type=float, default=30, help="Saniye")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Özetin yazılacağı JSON dosyası")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Aşılırsa çıkış kodu 1")
+    args = parser.parse_args()
+
+    summary = await run(args.url, args.concurrency, args.duration, args.seed)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 1 if summary["total"]["error_rate"] > args.max_error_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
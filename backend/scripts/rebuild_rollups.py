@@ -0,0 +1,32 @@
+"""
+daily_revenue özet tablosunu customers tablosundan yeniden hesapla
+
+Yanıt önbelleği yalnızca RESPONSE_CACHE_BACKEND=sqlite ise sunucu için de
+temizlenir; memory backend'de sunucu en geç RESPONSE_CACHE_MEMORY_TTL_SECONDS
+sonra yeni toplamları görür.
+
+Kullanım (backend/ dizininde):
+    python -m scripts.rebuild_rollups
+"""
+import asyncio
+
+from app.database import AsyncSessionLocal, async_engine
+from app import rollups, response_cache
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        try:
+            rows = await rollups.rebuild(db)
+            await db.commit()
+            await response_cache.invalidate(response_cache.CUSTOMERS)
+            print(f"✅ daily_revenue yeniden hesaplandı ({rows} satır)")
+        except Exception as e:
+            await db.rollback()
+            print(f"❌ Hata: {e}")
+            raise
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
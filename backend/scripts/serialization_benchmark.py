@@ -0,0 +1,152 @@
+"""
+Liste yanıtlarının serileştirme benchmark'ı: response_model yolu vs fast_json
+
+Her satır sayısı için iki yol ölçülür (sorgu dahil, HTTP katmanı hariç):
+    model     - ORM nesneleri çekilir, FastAPI'nin yaptığı gibi response_model
+                ile doğrulanıp pydantic ile JSON'a çevrilir
+    fast_json - kolon tuple'ları çekilir ve orjson ile doğrudan byte'a çevrilir
+İki yolun ürettiği byte'lar karşılaştırılır; farklıysa çıkış kodu 1 olur.
+customer-revenue için jsonable_encoder + JSONResponse ile fast_json karşılaştırılır.
+
+Kullanım (backend/ dizininde, veri yüklüyken — ör. scripts.generate_data):
+    python -m scripts.serialization_benchmark --rows 100,1000,10000 --iterations 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+
+from app import fast_json
+from app.database import AsyncSessionLocal, async_engine
+from app.models import Customer, User
+from app.schemas import CustomerResponse, UserResponse
+from app.routers.customers import RESPONSE_COLUMNS as CUSTOMER_COLUMNS
+from app.routers.users import RESPONSE_COLUMNS as USER_COLUMNS
+
+CUSTOMER_LIST = TypeAdapter(List[CustomerResponse])
+USER_LIST = TypeAdapter(List[UserResponse])
+
+
+def _revenue_row(customer_id, name, surname, email, revenue, created_at) -> dict:
+    return {
+        "id": customer_id,
+        "name": f"{name} {surname}",
+        "email": email,
+        "revenue": float(revenue),
+        "created_at": created_at.isoformat()
+    }
+
+
+async def customers_model(db, rows: int) -> bytes:
+    result = await db.execute(
+        select(Customer).order_by(Customer.created_at.desc(), Customer.id.desc()).limit(rows)
+    )
+    return CUSTOMER_LIST.dump_json(CUSTOMER_LIST.validate_python(result.scalars().all(), from_attributes=True))
+
+
+async def customers_fast(db, rows: int) -> bytes:
+    result = await db.execute(
+        select(*(getattr(Customer, column) for column in CUSTOMER_COLUMNS))
+        .order_by(Customer.created_at.desc(), Customer.id.desc()).limit(rows)
+    )
+    return fast_json.rows_response(CUSTOMER_COLUMNS, result.all()).body
+
+
+async def users_model(db, rows: int) -> bytes:
+    result = await db.execute(select(User).order_by(User.created_at.desc()).limit(rows))
+    return USER_LIST.dump_json(USER_LIST.validate_python(result.scalars().all(), from_attributes=True))
+
+
+async def users_fast(db, rows: int) -> bytes:
+    result = await db.execute(
+        select(*(getattr(User, column) for column in USER_COLUMNS)).order_by(User.created_at.desc()).limit(rows)
+    )
+    return fast_json.rows_response(USER_COLUMNS, result.all()).body
+
+
+def _revenue_query(rows: int):
+    return select(
+        Customer.id, Customer.name, Customer.surname, Customer.email, Customer.revenue, Customer.created_at
+    ).where(Customer.is_deleted == False).order_by(Customer.revenue.desc(), Customer.id).limit(rows)
+
+
+async def revenue_model(db, rows: int) -> bytes:
+    result = await db.execute(_revenue_query(rows))
+    return JSONResponse(content=jsonable_encoder([_revenue_row(*row) for row in result.all()])).body
+
+
+async def revenue_fast(db, rows: int) -> bytes:
+    result = await db.execute(_revenue_query(rows))
+    return fast_json.dumps([_revenue_row(*row) for row in result.all()])
+
+
+Path = Callable[..., Awaitable[bytes]]
+
+CASES: Dict[str, Dict[str, Path]] = {
+    "customers.list": {"model": customers_model, "fast_json": customers_fast},
+    "users.list": {"model": users_model, "fast_json": users_fast},
+    "financial.customer_revenue": {"model": revenue_model, "fast_json": revenue_fast},
+}
+
+
+async def measure(path: Path, rows: int, iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await path(db, rows)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(sizes: List[int], iterations: int) -> int:
+    async with AsyncSessionLocal() as db:
+        customers = await db.scalar(select(func.count(Customer.id)))
+        users = await db.scalar(select(func.count(User.id)))
+    print(f"Veri: {customers} müşteri, {users} kullanıcı\n")
+    print(f"{'endpoint':<28} {'satır':>7} {'model p50':>11} {'fast p50':>10} {'hızlanma':>9}  byte'lar")
+
+    mismatches = 0
+    for name, paths in CASES.items():
+        for rows in sizes:
+            async with AsyncSessionLocal() as db:
+                expected = await paths["model"](db, rows)
+                actual = await paths["fast_json"](db, rows)
+            same = expected == actual
+            mismatches += not same
+
+            # Isınma (önbellekler, ilk bağlantı) ölçüme katılmaz
+            await measure(paths["model"], rows, 1)
+            await measure(paths["fast_json"], rows, 1)
+            model = statistics.median(await measure(paths["model"], rows, iterations))
+            fast = statistics.median(await measure(paths["fast_json"], rows, iterations))
+            print(
+                f"{name:<28} {rows:>7} {model:>9.2f}ms {fast:>8.2f}ms {model / fast:>8.1f}x  "
+                f"{'aynı' if same else 'FARKLI'} ({len(actual)} B)"
+            )
+
+    await async_engine.dispose()
+    if mismatches:
+        print(f"\n❌ {mismatches} durumda fast_json çıktısı response_model çıktısından farklı")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="response_model ile fast_json serileştirmesini karşılaştır")
+    parser.add_argument("--rows", default="100,1000,10000", help="Virgülle ayrılmış satır sayıları")
+    parser.add_argument("--iterations", type=int, default=20, help="Her ölçümdeki tekrar sayısı")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.rows.split(",")]
+    return asyncio.run(run(sizes, args.iterations))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
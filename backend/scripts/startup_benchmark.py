@@ -0,0 +1,112 @@
+"""
+Soğuk başlangıç benchmark'ı: `import app.main`'den ilk yanıta kadar geçen süre
+
+Her ölçüm yeni bir Python sürecinde yapılır (serverless soğuk başlangıç gibi):
+süreç app.main'i import eder ve uygulamaya ASGI üzerinden (ağ yok) ilk isteği
+gönderir. Import süresi, ilk istek süresi ve toplamın medyan/en kötü değerleri
+raporlanır; `--top` ile en pahalı import'lar da listelenir (`-X importtime`).
+
+Kullanım (backend/ dizininde):
+    python -m scripts.startup_benchmark --runs 10
+    python -m scripts.startup_benchmark --path /api/auth/me --top 15 --max-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Alt süreçte çalışan ölçüm (ilk satır import'tan önce saat başlatır)
+CHILD = """
+import time
+started = time.perf_counter()
+import asyncio, json, sys
+import app.main
+imported = time.perf_counter()
+
+async def first_request():
+    import httpx
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        response = await client.get(sys.argv[1])
+    return response.status_code
+
+status = asyncio.run(first_request())
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (finished - imported) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "status": status,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def measure(path: str) -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> List[Tuple[int, str]]:
+    """`-X importtime` çıktısından kümülatif süresi en yüksek modüller (µs)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import'tan ilk yanıta kadar soğuk başlangıç süresi")
+    parser.add_argument("--runs", type=int, default=10, help="Ölçüm sayısı (her biri ayrı süreç)")
+    parser.add_argument("--path", default="/api/health", help="İlk isteğin yolu")
+    parser.add_argument("--top", type=int, default=0, help="En pahalı N import'u listele")
+    parser.add_argument("--max-ms", type=float, help="Medyan toplam süre bunu aşarsa çıkış kodu 1")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    runs = [measure(args.path) for _ in range(args.runs)]
+    statuses = {run["status"] for run in runs}
+    summary = {
+        "path": args.path,
+        "runs": args.runs,
+        "status": sorted(statuses),
+        "modules": runs[-1]["modules"],
+    }
+    for key in ("import_ms", "first_response_ms", "total_ms"):
+        values = [run[key] for run in runs]
+        summary[key] = {"median": round(statistics.median(values), 1), "max": round(max(values), 1)}
+        print(f"{key:<20} medyan {summary[key]['median']:>8.1f} ms   en kötü {summary[key]['max']:>8.1f} ms")
+    print(f"{'durum kodu':<20} {', '.join(map(str, summary['status']))}   ({summary['modules']} modül yüklü)")
+
+    if args.top:
+        print(f"\nEn pahalı {args.top} import (kümülatif):")
+        for microseconds, name in slowest_imports(args.top):
+            print(f"   {microseconds / 1000:>8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    if args.max_ms is not None and summary["total_ms"]["median"] > args.max_ms:
+        print(f"\n❌ Medyan {summary['total_ms']['median']} ms > {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
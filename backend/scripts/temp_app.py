@@ -0,0 +1,57 @@
+"""
+Kontrol script'leri için geçici veritabanlı uygulama ve oturum açmış istemci
+
+Geçici bir SQLite veritabanı oluşturulur (yanıt önbelleği kapalı), tablolar
+create_all ile kurulur, tüm yetkilere sahip bir yönetici eklenir ve uygulamaya
+ASGI üzerinden (ağ yok) bağlanan, Authorization başlığı ayarlı bir istemci
+döndürülür. Ortam değişkenleri uygulama import edilmeden önce ayarlanmalıdır;
+bu yüzden script'ler app modüllerini ancak bu bağlamın içinde import eder.
+
+    async with temporary_app("pagination-check") as client:
+        await client.get("/api/customers")
+"""
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Tuple
+
+
+def admin_credentials(name: str) -> Tuple[str, str]:
+    """temporary_app(name)'in oluşturduğu yöneticinin (e-posta, şifre) bilgisi"""
+    return f"{name}@kampus.com", name
+
+
+@asynccontextmanager
+async def temporary_app(name: str) -> AsyncIterator["httpx.AsyncClient"]:
+    """`name`: veritabanı dosyası, yönetici e-postası ve base_url için kullanılır"""
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, f'{name}.db')}"
+        os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+        import httpx
+        from app.main import app
+        from app.database import AsyncSessionLocal, Base, async_engine
+        from app.models import User
+        from app.user_cache import PERMISSIONS
+        from app.utils import get_password_hash
+
+        email, password = admin_credentials(name)
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSessionLocal() as db:
+            db.add(User(
+                email=email,
+                password=get_password_hash(password),
+                **{permission: True for permission in PERMISSIONS}
+            ))
+            await db.commit()
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=f"http://{name}")
+        try:
+            login = await client.post("/api/auth/login-json", json={"email": email, "password": password})
+            login.raise_for_status()
+            client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+            yield client
+        finally:
+            await client.aclose()
+            await async_engine.dispose()
@@ -1,14 +1,9 @@
 """
 Veritabanını seed et (ilk kullanıcıları ekle)
-"""
-from app.database import SessionLocal, engine, Base
-from app.models import User
-from app.utils import get_password_hash
-
-# Veritabanı tablolarını oluştur
-Base.metadata.create_all(bind=engine)
 
-db = SessionLocal()
+`users_data` yük testi (scripts/load_test.py) tarafından yetki profilleri
+olarak da kullanılır; import edildiğinde veritabanına dokunulmaz.
+"""
 
 # Kullanıcıları oluştur
 users_data = [
@@ -84,33 +79,45 @@ users_data = [
     },
 ]
 
-try:
-    for user_data in users_data:
-        # Kullanıcı zaten var mı kontrol et
-        existing_user = db.query(User).filter(User.email == user_data["email"]).first()
-        
-        if not existing_user:
-            user = User(
-                email=user_data["email"],
-                password=get_password_hash(user_data["password"]),
-                can_manage_customers=user_data["can_manage_customers"],
-                can_manage_financial=user_data["can_manage_financial"],
-                can_manage_collaboration_codes=user_data["can_manage_collaboration_codes"],
-                can_view_collaboration_stats=user_data["can_view_collaboration_stats"],
-                can_manage_access=user_data["can_manage_access"],
-                can_delete_users=user_data["can_delete_users"]
-            )
-            db.add(user)
-            print(f"✅ Kullanıcı eklendi: {user_data['email']}")
-        else:
-            print(f"ℹ️  Kullanıcı zaten mevcut: {user_data['email']}")
+def seed():
+    """users_data'daki kullanıcıları (yoksa) ekle"""
+    from app.database import sync_session
+    from app.models import User
+    from app.utils import get_password_hash
     
-    db.commit()
-    print("\n✅ Seed tamamlandı!")
+    # Tablolar `alembic upgrade head` ile oluşturulur
+    db = sync_session()
     
-except Exception as e:
-    db.rollback()
-    print(f"❌ Hata: {e}")
-finally:
-    db.close()
+    try:
+        for user_data in users_data:
+            # Kullanıcı zaten var mı kontrol et
+            existing_user = db.query(User).filter(User.email == user_data["email"]).first()
+            
+            if not existing_user:
+                user = User(
+                    email=user_data["email"],
+                    password=get_password_hash(user_data["password"]),
+                    can_manage_customers=user_data["can_manage_customers"],
+                    can_manage_financial=user_data["can_manage_financial"],
+                    can_manage_collaboration_codes=user_data["can_manage_collaboration_codes"],
+                    can_view_collaboration_stats=user_data["can_view_collaboration_stats"],
+                    can_manage_access=user_data["can_manage_access"],
+                    can_delete_users=user_data["can_delete_users"]
+                )
+                db.add(user)
+                print(f"✅ Kullanıcı eklendi: {user_data['email']}")
+            else:
+                print(f"ℹ️  Kullanıcı zaten mevcut: {user_data['email']}")
+        
+        db.commit()
+        print("\n✅ Seed tamamlandı!")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Hata: {e}")
+    finally:
+        db.close()
+
 
+if __name__ == "__main__":
+    seed()